@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+"""
+Servidores locais que imitam as APIs do Freshdesk (v2) e do Jira (v3) para benchmark
+"""
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlparse, parse_qs
+
+PROJECT_KEY = 'BENCH'
+
+# Status Freshdesk sincronizados e a transição Jira de cada um; a transição
+# "<status>1" leva a issue ao status Jira de id "<status>"
+FRESHDESK_STATUSES = (2, 3, 4, 5)
+TRANSITIONS = {status: f"{status}1" for status in FRESHDESK_STATUSES}
+INITIAL_ISSUE_STATUS = '1'
+
+SEARCH_PAGE_SIZE = 30
+
+# Tarefas de transição em lote ficam RUNNING por este múltiplo da latência média
+BULK_TASK_LATENCIES = 3
+
+
+@dataclass
+class FakeOptions:
+    """Parâmetros dos servidores falsos"""
+    tickets: int = 500
+    tag_ratio: float = 0.8        # fração das issues com [FD-X] no título
+    irrelevant_ratio: float = 0.1  # tickets em status sem transição configurada
+    latency_ms: float = 20.0       # latência média por requisição
+    error_rate: float = 0.0        # fração de respostas 500
+    rate_limit: int = 60000        # cota por minuto anunciada nos cabeçalhos (0 = sem cabeçalhos)
+    seed: int = 42
+
+
+class Dataset:
+    """Tickets Freshdesk e issues Jira correspondentes, gerados de forma determinística"""
+
+    def __init__(self, options: FakeOptions):
+        rng = random.Random(options.seed)
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.lock = threading.Lock()
+        self.tickets: Dict[int, Dict[str, Any]] = {}
+        self.issues: Dict[str, Dict[str, Any]] = {}
+        self.bulk_tasks: Dict[str, Dict[str, Any]] = {}
+
+        for ticket_id in range(1, options.tickets + 1):
+            created = now - timedelta(hours=rng.uniform(1, 72))
+            updated = now - timedelta(minutes=rng.uniform(1, 600))
+            if rng.random() < options.irrelevant_ratio:
+                status = 6
+            else:
+                status = rng.choice(FRESHDESK_STATUSES)
+            self.tickets[ticket_id] = {
+                'id': ticket_id,
+                'subject': f"Chamado de benchmark {ticket_id}",
+                'status': status,
+                'priority': 1,
+                'created_at': _iso(created),
+                'updated_at': _iso(updated),
+            }
+
+            key = f"{PROJECT_KEY}-{ticket_id}"
+            summary = f"Ticket criado: Chamado de benchmark {ticket_id}"
+            if rng.random() < options.tag_ratio:
+                summary = f"[FD-{ticket_id}] {summary}"
+            self.issues[key] = {
+                'key': key,
+                'summary': summary,
+                'status': INITIAL_ISSUE_STATUS,
+                'created': created,
+            }
+
+        self.ticket_order = sorted(self.tickets.values(), key=lambda t: t['updated_at'])
+
+    def issue_doc(self, issue: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'id': issue['key'].split('-')[1],
+            'key': issue['key'],
+            'fields': {
+                'summary': issue['summary'],
+                'status': {'id': issue['status'], 'name': f"Status {issue['status']}"},
+                'created': issue['created'].strftime('%Y-%m-%dT%H:%M:%S.000+0000'),
+                'issuetype': {'id': '10001'},
+                'project': {'key': PROJECT_KEY},
+            }
+        }
+
+    def transitions_for(self, issue: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Todas as transições cujo destino não é o status atual"""
+        return [
+            {'id': transition_id, 'name': f"Para {status}", 'to': {'id': str(status)}}
+            for status, transition_id in TRANSITIONS.items()
+            if str(status) != issue['status']
+        ]
+
+
+def _iso(value: datetime) -> str:
+    return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class _Quota:
+    """Cota por minuto com os cabeçalhos X-RateLimit-* do Freshdesk"""
+
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self.window_start = time.monotonic()
+        self.used = 0
+        self.lock = threading.Lock()
+
+    def take(self) -> Tuple[bool, Dict[str, str]]:
+        if not self.per_minute:
+            return True, {}
+        with self.lock:
+            now = time.monotonic()
+            if now - self.window_start >= 60:
+                self.window_start, self.used = now, 0
+            allowed = self.used < self.per_minute
+            if allowed:
+                self.used += 1
+            headers = {
+                'X-RateLimit-Total': str(self.per_minute),
+                'X-RateLimit-Remaining': str(max(self.per_minute - self.used, 0)),
+            }
+            if not allowed:
+                headers['Retry-After'] = str(max(1, int(60 - (now - self.window_start))))
+            return allowed, headers
+
+
+class _FakeHandler(BaseHTTPRequestHandler):
+    """Base comum: latência, erros simulados, cota e respostas JSON"""
+
+    protocol_version = 'HTTP/1.1'
+    dataset: Dataset = None
+    options: FakeOptions = None
+    quota: _Quota = None
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def _dispatch(self, method: str):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length) or b'{}') if length else {}
+
+        if self.options.latency_ms:
+            time.sleep(random.uniform(0.5, 1.5) * self.options.latency_ms / 1000)
+
+        allowed, headers = self.quota.take()
+        if not allowed:
+            return self._reply(429, {'message': 'rate limited'}, headers)
+        if self.options.error_rate and random.random() < self.options.error_rate:
+            return self._reply(500, {'message': 'erro simulado'}, headers)
+
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        status, payload, extra = self.route(method, url.path, params, body)
+        headers.update(extra)
+        self._reply(status, payload, headers)
+
+    def route(self, method: str, path: str, params: Dict[str, str],
+              body: Dict[str, Any]) -> Tuple[int, Any, Dict[str, str]]:
+        raise NotImplementedError
+
+    def _reply(self, status: int, payload: Any, headers: Dict[str, str]):
+        data = b'' if payload is None else json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if data:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FreshdeskHandler(_FakeHandler):
+    """/api/v2/tickets, /api/v2/tickets/{id} e /api/v2/search/tickets"""
+
+    def route(self, method, path, params, body):
+        if path == '/api/v2/tickets':
+            return self._list(params)
+        if path == '/api/v2/search/tickets':
+            return self._search(params)
+
+        match = re.fullmatch(r'/api/v2/tickets/(\d+)', path)
+        if match:
+            ticket = self.dataset.tickets.get(int(match.group(1)))
+            return (200, ticket, {}) if ticket else (404, {'message': 'not found'}, {})
+        return 404, {'message': 'not found'}, {}
+
+    def _list(self, params):
+        since = params.get('updated_since', '')
+        per_page = int(params.get('per_page', 30))
+        page = int(params.get('page', 1))
+
+        matching = [t for t in self.dataset.ticket_order if t['updated_at'] >= since]
+        chunk = matching[(page - 1) * per_page:page * per_page]
+
+        headers = {}
+        if page * per_page < len(matching):
+            headers['Link'] = f'<{self.path.split("?")[0]}?per_page={per_page}&page={page + 1}>; rel="next"'
+        return 200, chunk, headers
+
+    def _search(self, params):
+        query = params.get('query', '')
+        statuses = {int(s) for s in re.findall(r'status:(\d+)', query)}
+        since = re.search(r"updated_at:>'(\d{4}-\d{2}-\d{2})'", query)
+        since_date = since.group(1) if since else ''
+        until = re.search(r"updated_at:<'(\d{4}-\d{2}-\d{2})'", query)
+        until_date = until.group(1) if until else '9999-12-31'
+        page = int(params.get('page', 1))
+
+        # Datas comparadas de forma inclusiva, como na API de busca do Freshdesk
+        matching = [
+            t for t in self.dataset.ticket_order
+            if (not statuses or t['status'] in statuses) and since_date <= t['updated_at'][:10] <= until_date
+        ]
+        chunk = matching[(page - 1) * SEARCH_PAGE_SIZE:page * SEARCH_PAGE_SIZE]
+        return 200, {'results': chunk, 'total': len(matching)}, {}
+
+
+class JiraHandler(_FakeHandler):
+    """/myself, /search, /issue/{key}, /issue/{key}/transitions e transição em lote (/bulk)"""
+
+    def route(self, method, path, params, body):
+        if path == '/rest/api/3/myself':
+            return 200, {'accountId': 'bench', 'displayName': 'Benchmark'}, {}
+        if path == '/rest/api/3/search':
+            return self._search(params)
+        if path == '/rest/api/3/bulk/issues/transition' and method == 'POST':
+            return self._bulk_transition(body)
+
+        task = re.fullmatch(r'/rest/api/3/bulk/queue/(\d+)', path)
+        if task:
+            return self._bulk_task(task.group(1))
+
+        match = re.fullmatch(r'/rest/api/3/issue/([A-Z]+-\d+)(/transitions)?', path)
+        if not match:
+            return 404, {'errorMessages': ['not found']}, {}
+
+        issue = self.dataset.issues.get(match.group(1))
+        if issue is None:
+            return 404, {'errorMessages': ['Issue does not exist']}, {}
+        if not match.group(2):
+            return 200, self.dataset.issue_doc(issue), {}
+        if method == 'GET':
+            return 200, {'transitions': self.dataset.transitions_for(issue)}, {}
+        return self._transition(issue, body)
+
+    def _transition(self, issue, body):
+        transition_id = (body.get('transition') or {}).get('id')
+        with self.dataset.lock:
+            offered = {t['id']: t['to']['id'] for t in self.dataset.transitions_for(issue)}
+            if transition_id not in offered:
+                return 400, {'errorMessages': ['Transition is not valid']}, {}
+            issue['status'] = offered[transition_id]
+        return 204, None, {}
+
+    def _bulk_transition(self, body):
+        """Aplica as transições na hora; a tarefa só aparece concluída depois de um atraso"""
+        processed, failed = [], {}
+        for selection in body.get('bulkTransitionInputs') or []:
+            transition = {'transition': {'id': selection.get('transitionId')}}
+            for key in selection.get('selectedIssueIdsOrKeys') or []:
+                issue = self.dataset.issues.get(key)
+                if issue is None:
+                    failed[key] = ['Issue does not exist']
+                    continue
+                status, payload, _ = self._transition(issue, transition)
+                issue_id = int(issue['key'].split('-')[1])
+                if status == 204:
+                    processed.append(issue_id)
+                else:
+                    failed[str(issue_id)] = payload['errorMessages']
+
+        with self.dataset.lock:
+            task_id = str(10000 + len(self.dataset.bulk_tasks))
+            self.dataset.bulk_tasks[task_id] = {
+                'ready_at': time.monotonic() + BULK_TASK_LATENCIES * self.options.latency_ms / 1000,
+                'processed': processed,
+                'failed': failed,
+            }
+        return 201, {'taskId': task_id}, {}
+
+    def _bulk_task(self, task_id):
+        task = self.dataset.bulk_tasks.get(task_id)
+        if task is None:
+            return 404, {'errorMessages': ['Task not found']}, {}
+        total = len(task['processed']) + len(task['failed'])
+        if time.monotonic() < task['ready_at']:
+            return 200, {'taskId': task_id, 'status': 'RUNNING', 'progressPercent': 50,
+                         'totalIssueCount': total}, {}
+        return 200, {
+            'taskId': task_id,
+            'status': 'COMPLETE',
+            'progressPercent': 100,
+            'processedAccessibleIssues': task['processed'],
+            'failedAccessibleIssues': task['failed'],
+            'invalidOrInaccessibleIssueCount': 0,
+            'totalIssueCount': total,
+        }, {}
+
+    def _search(self, params):
+        jql = params.get('jql', '')
+        start_at = int(params.get('startAt', 0))
+        max_results = int(params.get('maxResults', 50))
+
+        try:
+            issues = self._filter(jql)
+        except KeyError as e:
+            return 400, {'errorMessages': [f"An issue with key '{e.args[0]}' does not exist"]}, {}
+
+        if 'ORDER BY created DESC' in jql:
+            issues.sort(key=lambda i: i['created'], reverse=True)
+        chunk = issues[start_at:start_at + max_results]
+        return 200, {
+            'startAt': start_at,
+            'maxResults': max_results,
+            'total': len(issues),
+            'issues': [self.dataset.issue_doc(issue) for issue in chunk],
+        }, {}
+
+    def _filter(self, jql: str) -> List[Dict[str, Any]]:
+        """Subconjunto do JQL usado pela sincronização"""
+        issues = self.dataset.issues
+
+        keys = re.search(r'key in \(([^)]*)\)', jql)
+        if keys:
+            return [issues[key.strip()] for key in keys.group(1).split(',') if key.strip()]
+
+        tags = re.findall(r'summary ~ "\[FD-(\d+)\]"', jql)
+        if tags:
+            wanted = {f"[FD-{tag}]" for tag in tags}
+            return [i for i in issues.values() if i['summary'].split(' ', 1)[0] in wanted]
+
+        day = re.search(r'created >= "(\d{4}-\d{2}-\d{2})"', jql)
+        if day:
+            return [i for i in issues.values() if i['created'].strftime('%Y-%m-%d') == day.group(1)]
+
+        if 'summary ~ "Ticket criado"' in jql:
+            return [i for i in issues.values() if '[FD-' not in i['summary']]
+
+        return list(issues.values())
+
+
+def _server(handler: type, dataset: Dataset, options: FakeOptions) -> ThreadingHTTPServer:
+    bound = type(handler.__name__, (handler,), {
+        'dataset': dataset,
+        'options': options,
+        'quota': _Quota(options.rate_limit),
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', 0), bound)
+    server.daemon_threads = True
+    return server
+
+
+def serve(options: FakeOptions, ready=None):
+    """Sobe os dois servidores e bloqueia; envia (porta Freshdesk, porta Jira) por `ready`"""
+    dataset = Dataset(options)
+    servers = [_server(FreshdeskHandler, dataset, options), _server(JiraHandler, dataset, options)]
+
+    for server in servers[1:]:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    if ready is not None:
+        ready.send(tuple(server.server_address[1] for server in servers))
+    servers[0].serve_forever()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark offline da sincronização contra os servidores falsos de bench.fake_server
+
+Uso: python -m bench.run [--tickets 500] [--latency-ms 20] [--workers 1] ...
+O resultado é acrescentado a bench_output.txt para comparar execuções.
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.fake_server import FakeOptions, PROJECT_KEY, TRANSITIONS, serve
+from providers.freshdesk import FreshdeskClient
+from providers.jira import JiraClient
+from schemas.ledger import SyncLedger
+from schemas.mappings import MappingIndex
+from schemas.retries import RetryQueue
+from schemas.state import open_state_db
+from services.sync import SyncService
+from settings import compile_client_config
+from utils.logger import get_logger
+from utils.metrics import MetricsRegistry
+from utils.timerange import HighWaterMark
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.path.join(ROOT_DIR, 'bench_output.txt')
+
+# Orçamento de partida: interpretador + import de main.py + construção do SyncService
+DEFAULT_STARTUP_BUDGET_MS = 400.0
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentil por posição mais próxima (0 se vazio)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    """Pico de memória residente do processo (ru_maxrss é KB no Linux, bytes no macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or '-'
+    except Exception:
+        return '-'
+
+
+def cold_import_ms() -> float:
+    """Tempo de `python -c "import main"` num processo novo (partida da CLI sem I/O)"""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'import main'], cwd=ROOT_DIR, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - started) * 1000
+
+
+def build_service(fd_port: int, jira_port: int, workers: int, bulk: bool = True) -> SyncService:
+    """SyncService apontado para os servidores locais, com estado SQLite em memória"""
+    config = compile_client_config('bench', {
+        'FRESHDESK_DOMAIN': 'bench',
+        'FRESHDESK_API_KEY': 'bench-key',
+        'FRESHDESK_BASE_URL': f'http://127.0.0.1:{fd_port}/api/v2',
+        'JIRA_BASE_URL': f'http://127.0.0.1:{jira_port}',
+        'JIRA_EMAIL': 'bench@example.com',
+        'JIRA_API_TOKEN': 'bench-token',
+        'JIRA_PROJECT_KEY': PROJECT_KEY,
+        'FRESHDESK_TO_JIRA_TRANSITIONS': TRANSITIONS,
+        'JIRA_BULK_TRANSITIONS': bulk,
+    })
+    metrics = MetricsRegistry()
+    freshdesk = FreshdeskClient(config.freshdesk_domain, config.freshdesk_api_key, max_concurrency=max(4, workers),
+                                base_url=config.freshdesk_base_url, metrics=metrics)
+    jira = JiraClient(config.jira_base_url, config.jira_email, config.jira_api_token,
+                      pool_size=max(10, workers), max_concurrency=max(4, workers), metrics=metrics)
+
+    state = open_state_db(':memory:')
+    return SyncService(
+        freshdesk, jira, config,
+        mappings=MappingIndex(state),
+        workers=workers,
+        watermark=HighWaterMark(state),
+        ledger=SyncLedger(state),
+        retries=RetryQueue(state),
+        metrics=metrics
+    )
+
+
+def run_benchmark(options: FakeOptions, workers: int, hours: int, bulk: bool = True) -> Dict[str, float]:
+    """Sobe os servidores num processo à parte, sincroniza e mede"""
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    server = multiprocessing.Process(target=serve, args=(options, sender), daemon=True)
+    server.start()
+    try:
+        fd_port, jira_port = receiver.recv()
+
+        constructed = time.perf_counter()
+        service = build_service(fd_port, jira_port, workers, bulk)
+        construct_ms = (time.perf_counter() - constructed) * 1000
+        service.set_dry_run(False)
+
+        # Latência por ticket: do início de sync_ticket à conclusão, que nas
+        # transições em lote só acontece depois do envio do lote da página
+        latencies: List[float] = []
+        record_result = service._record_result
+
+        def timed_record_result(ticket_id, result, started, *args):
+            latencies.append(time.perf_counter() - started)
+            return record_result(ticket_id, result, started, *args)
+
+        service._record_result = timed_record_result
+
+        before = [client.traffic_stats()['calls'] for client in (service.freshdesk, service.jira)]
+        started = time.perf_counter()
+        stats = service.sync_all_tickets(hours)
+        elapsed = time.perf_counter() - started
+        after = [client.traffic_stats()['calls'] for client in (service.freshdesk, service.jira)]
+    finally:
+        server.terminate()
+        server.join(timeout=5)
+
+    tickets = sum(stats.values())
+    calls = sum(after) - sum(before)
+    return {
+        'tickets': tickets,
+        'success': stats['success'],
+        'failed': stats['failed'],
+        'skipped': stats['skipped'],
+        'elapsed': elapsed,
+        'tickets_per_sec': tickets / elapsed if elapsed else 0.0,
+        'freshdesk_calls': after[0] - before[0],
+        'jira_calls': after[1] - before[1],
+        'calls_per_ticket': calls / tickets if tickets else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'peak_rss_mb': peak_rss_mb(),
+        'import_ms': cold_import_ms(),
+        'construct_ms': construct_ms,
+    }
+
+
+def format_report(options: FakeOptions, workers: int, result: Dict[str, float], startup_budget_ms: float,
+                  bulk: bool = True) -> str:
+    startup_ms = result['import_ms'] + result['construct_ms']
+    verdict = "dentro do orçamento" if startup_ms <= startup_budget_ms else "ACIMA DO ORÇAMENTO"
+    lines = [
+        f"=== {datetime.now().isoformat(timespec='seconds')} | rev {git_revision()} ===",
+        f"tickets={options.tickets} workers={workers} transitions={'bulk' if bulk else 'single'} "
+        f"latency_ms={options.latency_ms} "
+        f"error_rate={options.error_rate} rate_limit={options.rate_limit}/min "
+        f"tag_ratio={options.tag_ratio} seed={options.seed}",
+        f"processados:       {result['tickets']} ({result['success']} sucessos, "
+        f"{result['failed']} falhas, {result['skipped']} pulados)",
+        f"tempo total:       {result['elapsed']:.2f}s",
+        f"tickets/s:         {result['tickets_per_sec']:.1f}",
+        f"chamadas/ticket:   {result['calls_per_ticket']:.2f} "
+        f"(Freshdesk {result['freshdesk_calls']}, Jira {result['jira_calls']})",
+        f"latência p50/p99:  {result['p50_ms']:.1f}ms / {result['p99_ms']:.1f}ms",
+        f"pico de RSS:       {result['peak_rss_mb']:.1f} MB",
+        f"partida:           {startup_ms:.0f}ms (import {result['import_ms']:.0f}ms + "
+        f"SyncService {result['construct_ms']:.1f}ms) - {verdict} de {startup_budget_ms:.0f}ms",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline da sincronização Freshdesk → Jira")
+    parser.add_argument("--tickets", type=int, default=500, help="Tickets no dataset (padrão: 500)")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Latência média por chamada (padrão: 20)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fração de respostas 500 (padrão: 0)")
+    parser.add_argument("--rate-limit", type=int, default=60000,
+                        help="Cota por minuto dos cabeçalhos de rate limit, 0 desliga (padrão: 60000)")
+    parser.add_argument("--tag-ratio", type=float, default=0.8,
+                        help="Fração das issues com [FD-X] no título (padrão: 0.8)")
+    parser.add_argument("--seed", type=int, default=42, help="Semente do dataset (padrão: 42)")
+    parser.add_argument("--workers", type=int, default=1, help="Workers da sincronização (padrão: 1)")
+    parser.add_argument("--hours", type=int, default=96, help="Janela de busca em horas (padrão: 96)")
+    parser.add_argument("--single-transitions", action="store_true",
+                        help="Desligar a transição em lote (uma chamada por issue)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Arquivo de resultados (acrescenta)")
+    parser.add_argument("--startup-budget-ms", type=float, default=DEFAULT_STARTUP_BUDGET_MS,
+                        help=f"Orçamento de partida da CLI (padrão: {DEFAULT_STARTUP_BUDGET_MS:.0f})")
+    parser.add_argument("--verbose", action="store_true", help="Mostrar os logs da sincronização")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        get_logger().setLevel(logging.WARNING)
+
+    options = FakeOptions(
+        tickets=args.tickets,
+        tag_ratio=args.tag_ratio,
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        seed=args.seed
+    )
+    bulk = not args.single_transitions
+    result = run_benchmark(options, args.workers, args.hours, bulk)
+    report = format_report(options, args.workers, result, args.startup_budget_ms, bulk)
+
+    print(report, end="")
+    with open(args.output, 'a', encoding='utf-8') as output:
+        output.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
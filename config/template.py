@@ -35,6 +35,7 @@ FRESHDESK_TO_JIRA_TRANSITIONS = {
 # Pega das secrets do GitHub Actions ou variáveis de ambiente
 FRESHDESK_API_KEY = os.getenv('FRESHDESK_API_KEY')
 JIRA_API_TOKEN = os.getenv('JIRA_API_TOKEN')
+WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET')  # Token esperado em X-Webhook-Token (main.py serve)
 
 # Para desenvolvimento local, você pode usar:
 # FRESHDESK_API_KEY = os.getenv('FRESHDESK_API_KEY', 'SUA_KEY_LOCAL_AQUI')
@@ -50,7 +51,14 @@ JIRA_API_TOKEN = os.getenv('JIRA_API_TOKEN')
 
 DEFAULT_SYNC_HOURS = 2
 TICKET_TO_ISSUE_PREFIX = f"{JIRA_PROJECT_KEY}-"
-RATE_LIMIT_DELAY = 0.5
+RATE_LIMIT_DELAY = 0.5       # Legado: o ritmo agora segue os cabeçalhos de rate limit das APIs
+JIRA_POOL_SIZE = 10          # Conexões keep-alive reaproveitadas com o Jira
+FRESHDESK_MAX_CONCURRENCY = 4  # Chamadas simultâneas ao Freshdesk (--workers > 1)
+JIRA_MAX_CONCURRENCY = 4       # Chamadas simultâneas ao Jira (--workers > 1)
+JIRA_BULK_TRANSITIONS = True   # Agrupa as transições da página na API de lote (só Jira Cloud)
+FRESHDESK_SERVER_FILTER = True # Filtra por status no Freshdesk (API de busca) antes de baixar
+MAX_RETRIES = 3               # Novas tentativas de um ticket com falha antes do dead-letter
+RETRY_BASE_DELAY = 300        # Segundos até a primeira nova tentativa (dobra a cada falha)
 
 # Nomes dos status para logs (opcional)
 FRESHDESK_STATUS_NAMES = {
@@ -11,48 +11,43 @@ import os
 # Adicionar diretório atual ao path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from providers.freshdesk import FreshdeskClient
-from providers.jira import JiraClient
-from services.sync import SyncService
-from settings import load_client_config
-from utils.logger import get_logger
+# Módulos que puxam requests/urllib3 (clientes HTTP, serviço de sincronização,
+# engine, webhook) são importados dentro das funções: --help, --check-config e
+# erros de argumento respondem sem carregá-los
+from typing import TYPE_CHECKING
+
+from settings import discover_clients
+from utils.logger import get_logger, flush_logs
+from utils.metrics import write_report
+
+if TYPE_CHECKING:
+    from services.sync import SyncService
 
 logger = get_logger()
 
-def create_sync_service(client_name: str) -> SyncService:
+def create_sync_service(client_name: str, workers: int = 1) -> "SyncService":
     """Cria serviço de sincronização para cliente específico"""
+    from services.factory import build_sync_service
+    
     try:
-        config = load_client_config(client_name)
-        
-        freshdesk_client = FreshdeskClient(
-            config['FRESHDESK_DOMAIN'],
-            config['FRESHDESK_API_KEY']
-        )
-        
-        jira_client = JiraClient(
-            config['JIRA_BASE_URL'],
-            config['JIRA_EMAIL'],
-            config['JIRA_API_TOKEN']
-        )
-        
-        return SyncService(freshdesk_client, jira_client, config)
+        return build_sync_service(client_name, workers=workers)
         
     except Exception as e:
         logger.error(f"Erro ao criar serviço para cliente {client_name}: {e}")
         sys.exit(1)
 
-def test_connections(sync_service: SyncService) -> bool:
-    """Testa conexões com as APIs"""
+def test_connections(sync_service: "SyncService", force: bool = False) -> bool:
+    """Testa conexões com as APIs (reaproveita um teste recente, salvo com force)"""
     logger.info("Testando conexões...")
     
     print("🧪 Testando Freshdesk...")
-    if not sync_service.freshdesk.test_connection():
+    if not sync_service.freshdesk.check_health(force=force):
         print("❌ Falha na conexão com Freshdesk")
         return False
     print("✅ Freshdesk OK!")
     
     print("🧪 Testando Jira...")
-    if not sync_service.jira.test_connection():
+    if not sync_service.jira.check_health(force=force):
         print("❌ Falha na conexão com Jira")
         return False
     print("✅ Jira OK!")
@@ -65,6 +60,7 @@ def interactive_menu(client_name: str):
     sync_service = create_sync_service(client_name)
     
     while True:
+        flush_logs()
         print(f"\n🤖 SINCRONIZAÇÃO AUTOMÁTICA - Cliente: {client_name.upper()}")
         print("=" * 60)
         print("1. 🧪 Testar conexões")
@@ -76,7 +72,7 @@ def interactive_menu(client_name: str):
         choice = input("\nEscolha uma opção (1-5): ").strip()
         
         if choice == "1":
-            test_connections(sync_service)
+            test_connections(sync_service, force=True)
             
         elif choice == "2":
             hours = input("Horas atrás (padrão: 24): ").strip()
@@ -84,11 +80,18 @@ def interactive_menu(client_name: str):
             
             print(f"\n🔍 MODO SIMULAÇÃO - Buscando tickets das últimas {hours}h")
             sync_service.set_dry_run(True)
-            stats = sync_service.sync_all_tickets(hours)
+            try:
+                stats = sync_service.sync_all_tickets(hours)
+            except ConnectionError as e:
+                flush_logs()
+                print(f"❌ {e}")
+                continue
+            flush_logs()
             
-            print(f"\n🎯 RESULTADO DA SIMULAÇÃO:")
+            print("\n🎯 RESULTADO DA SIMULAÇÃO:")
             print(f"   ✅ Sucessos: {stats['success']}")
             print(f"   ❌ Falhas: {stats['failed']}")
+            print(f"   ⏭️ Pulados: {stats['skipped']}")
             print(f"   📊 Total: {stats['success'] + stats['failed']}")
             
         elif choice == "3":
@@ -101,21 +104,24 @@ def interactive_menu(client_name: str):
                 hours = input("Horas atrás (padrão: 24): ").strip()
                 hours = int(hours) if hours else 24
                 
-                print(f"\n🚀 EXECUTANDO SINCRONIZAÇÃO REAL...")
+                print("\n🚀 EXECUTANDO SINCRONIZAÇÃO REAL...")
                 sync_service.set_dry_run(False)
-                stats = sync_service.sync_all_tickets(hours)
+                try:
+                    stats = sync_service.sync_all_tickets(hours)
+                except ConnectionError as e:
+                    flush_logs()
+                    print(f"❌ {e}")
+                    continue
+                flush_logs()
                 
-                print(f"\n🎉 EXECUÇÃO CONCLUÍDA!")
+                print("\n🎉 EXECUÇÃO CONCLUÍDA!")
                 print(f"   ✅ Sucessos: {stats['success']}")
                 print(f"   ❌ Falhas: {stats['failed']}")
+                print(f"   ⏭️ Pulados: {stats['skipped']}")
                 print(f"   📊 Total processado: {stats['success'] + stats['failed']}")
                 
                 if stats['success'] > 0:
-                    config = sync_service.config
-                    jira_url = config.get('JIRA_BASE_URL', '')
-                    project_key = config.get('JIRA_PROJECT_KEY', '')
-                    if jira_url and project_key:
-                        print(f"\n🔗 Verificar no Jira: {jira_url}")
+                    print(f"\n🔗 Verificar no Jira: {sync_service.config.jira_base_url}")
             else:
                 print("❌ Execução cancelada pelo usuário")
                 
@@ -123,18 +129,15 @@ def interactive_menu(client_name: str):
             config = sync_service.config
             print(f"\n📋 CONFIGURAÇÕES - {client_name.upper()}")
             print("=" * 40)
-            print(f"🔗 Freshdesk: {config.get('FRESHDESK_DOMAIN', 'N/A')}")
-            print(f"🔗 Jira: {config.get('JIRA_BASE_URL', 'N/A')}")
-            print(f"🎯 Projeto: {config.get('JIRA_PROJECT_KEY', 'N/A')}")
-            print(f"⏰ Sync padrão: {config.get('DEFAULT_SYNC_HOURS', 24)}h")
-            print(f"⏱️  Rate limit: {config.get('RATE_LIMIT_DELAY', 1)}s")
-            
-            print(f"\n📊 Mapeamento de Status:")
-            transitions = config.get('FRESHDESK_TO_JIRA_TRANSITIONS', {})
-            status_names = config.get('FRESHDESK_STATUS_NAMES', {})
+            print(f"🔗 Freshdesk: {config.freshdesk_domain}")
+            print(f"🔗 Jira: {config.jira_base_url}")
+            print(f"🎯 Projeto: {config.jira_project_key}")
+            print(f"⏰ Sync padrão: {config.default_sync_hours}h")
+            print("⏱️  Rate limit: adaptativo (cabeçalhos X-RateLimit/Retry-After)")
             
-            for freshdesk_id, jira_transition in transitions.items():
-                freshdesk_name = status_names.get(freshdesk_id, f"Status {freshdesk_id}")
+            print("\n📊 Mapeamento de Status:")
+            for freshdesk_id, jira_transition in config.transitions.items():
+                freshdesk_name = config.status_names.get(freshdesk_id, f"Status {freshdesk_id}")
                 print(f"   {freshdesk_id} ({freshdesk_name}) → Transição {jira_transition}")
             
         elif choice == "5":
@@ -146,8 +149,308 @@ def interactive_menu(client_name: str):
         
         input("\n⏳ Pressione Enter para continuar...")
 
+def check_client_configs():
+    """Valida a configuração de todos os clientes de config/, sem conectar às APIs"""
+    from settings import ConfigError, load_all_client_configs
+    
+    try:
+        configs = load_all_client_configs()
+    except ConfigError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
+    print(f"✅ {len(configs)} configurações válidas:")
+    for client_name, config in configs.items():
+        print(f"   • {client_name}: {config.jira_project_key} ({len(config.transitions)} transições)")
+
+def run_all_clients(args):
+    """Sincroniza todos os clientes concorrentemente"""
+    from services.engine import MultiTenantEngine
+    
+    mode = "SIMULAÇÃO" if args.dry_run else "EXECUÇÃO REAL"
+    print(f"🌐 {mode} multi-cliente - Últimas {args.hours}h")
+    
+    engine = MultiTenantEngine(workers=args.workers, dry_run=args.dry_run, incremental=args.incremental,
+                               metrics_dir=args.metrics, skip_health_check=args.skip_health_check)
+    results = engine.run_all(args.hours)
+    flush_logs()
+    
+    print("\n📊 RESULTADO POR CLIENTE:")
+    for client_name, stats in results.items():
+        if 'error' in stats:
+            print(f"   ❌ {client_name}: {stats['error']}")
+        else:
+            print(f"   ✅ {client_name}: {stats['success']} sucessos, {stats['failed']} falhas, "
+                  f"{stats['skipped']} pulados ({stats['elapsed']}s)")
+    
+    if any('error' in stats for stats in results.values()):
+        sys.exit(1)
+
+def serve_command(argv):
+    """Servidor de webhooks do Freshdesk para um cliente"""
+    from services.webhook import WebhookServer, DEFAULT_DEBOUNCE
+    
+    parser = argparse.ArgumentParser(
+        prog="main.py serve",
+        description="Recebe webhooks de automação do Freshdesk e sincroniza em tempo real"
+    )
+    parser.add_argument("client", help="Nome do cliente (ex: grupo_multi)")
+    parser.add_argument("--host", default="0.0.0.0", help="Endereço de escuta (padrão: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=8080, help="Porta HTTP (padrão: 8080)")
+    parser.add_argument("--workers", type=int, default=2, help="Workers processando a fila (padrão: 2)")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE,
+                        help="Segundos para agrupar eventos do mesmo ticket (padrão: 2)")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas simular (não executar mudanças)")
+    args = parser.parse_args(argv)
+    
+    sync_service = create_sync_service(args.client)
+    sync_service.set_dry_run(args.dry_run)
+    try:
+        sync_service.check_connections()
+    except ConnectionError as e:
+        logger.error(f"❌ {e}")
+        sys.exit(1)
+    
+    secret = sync_service.config.webhook_secret or os.getenv('WEBHOOK_SECRET')
+    if not secret:
+        logger.warning("⚠️ WEBHOOK_SECRET não definido: o endpoint aceitará qualquer requisição")
+    
+    server = WebhookServer(
+        sync_service,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        secret=secret,
+        debounce=args.debounce
+    )
+    server.serve_forever()
+
+def retries_command(argv):
+    """Inspeciona e reenfileira a fila de retry de um cliente"""
+    from schemas.state import connect_state_db
+    from schemas.retries import RetryQueue, RETRY_DEAD
+    
+    parser = argparse.ArgumentParser(
+        prog="main.py retries",
+        description="Fila de novas tentativas de tickets com falha"
+    )
+    parser.add_argument("client", help="Nome do cliente (ex: grupo_multi)")
+    parser.add_argument("action", nargs="?", choices=["list", "replay"], default="list",
+                        help="list: mostra a fila (padrão); replay: reativa tickets para nova tentativa")
+    parser.add_argument("tickets", nargs="*", type=int,
+                        help="Tickets a reativar (padrão: todos em dead-letter)")
+    parser.add_argument("--run", action="store_true", help="Após o replay, processar os tickets agora")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas simular (não executar mudanças)")
+    args = parser.parse_args(argv)
+    
+    try:
+        queue = RetryQueue(connect_state_db(args.client))
+    except Exception as e:
+        logger.error(f"Erro ao abrir o estado do cliente {args.client}: {e}")
+        sys.exit(1)
+    
+    if args.action == "replay":
+        replayed = queue.replay(args.tickets or None)
+        print(f"🔁 {len(replayed)} tickets reativados: {', '.join(map(str, replayed)) or '-'}")
+        if args.run and replayed:
+            sync_service = create_sync_service(args.client)
+            sync_service.set_dry_run(args.dry_run)
+            stats = {"success": 0, "failed": 0, "skipped": 0}
+            sync_service.drain_retries(stats)
+            print(f"📊 {stats['success']} sucessos, {stats['failed']} falhas, {stats['skipped']} pulados")
+        return
+    
+    entries = queue.entries()
+    if not entries:
+        print("✅ Fila de retry vazia")
+        return
+    
+    print(f"📋 Fila de retry - {args.client}: {len(entries)} tickets")
+    for entry in entries:
+        icon = "💀" if entry.state == RETRY_DEAD else "⏳"
+        print(f"   {icon} #{entry.ticket_id}: {entry.attempts} falhas, próxima em {entry.next_attempt_at} "
+              f"- {entry.last_error or ''}")
+
+def daemon_command(argv):
+    """Sincronização contínua de vários clientes com intervalo adaptativo"""
+    import signal
+    from services.scheduler import SyncDaemon, DEFAULT_BUSY_THRESHOLD
+    from settings import DAEMON_MIN_INTERVAL, DAEMON_MAX_INTERVAL, DAEMON_START_INTERVAL
+    
+    parser = argparse.ArgumentParser(
+        prog="main.py daemon",
+        description="Mantém os serviços aquecidos e sincroniza cada cliente no próprio intervalo"
+    )
+    parser.add_argument("clients", nargs="*", help="Clientes a sincronizar (padrão: todos de config/)")
+    parser.add_argument("--workers", type=int, default=1, help="Tickets processados em paralelo por cliente")
+    parser.add_argument("--hours", type=int, default=24,
+                        help="Janela da primeira execução, antes de existir marca d'água (padrão: 24)")
+    parser.add_argument("--min-interval", type=float, default=DAEMON_MIN_INTERVAL,
+                        help=f"Menor intervalo entre execuções em segundos (padrão: {DAEMON_MIN_INTERVAL})")
+    parser.add_argument("--max-interval", type=float, default=DAEMON_MAX_INTERVAL,
+                        help=f"Maior intervalo entre execuções em segundos (padrão: {DAEMON_MAX_INTERVAL})")
+    parser.add_argument("--interval", type=float, default=DAEMON_START_INTERVAL,
+                        help=f"Intervalo inicial em segundos (padrão: {DAEMON_START_INTERVAL})")
+    parser.add_argument("--busy-threshold", type=int, default=DEFAULT_BUSY_THRESHOLD,
+                        help=f"Tickets alterados que encolhem o intervalo (padrão: {DEFAULT_BUSY_THRESHOLD})")
+    parser.add_argument("--metrics", metavar="DIR", help="Gravar relatório de métricas após cada execução")
+    parser.add_argument("--skip-health-check", action="store_true",
+                        help="Não testar as conexões antes de sincronizar")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas simular (não executar mudanças)")
+    args = parser.parse_args(argv)
+    
+    if args.min_interval <= 0 or args.max_interval < args.min_interval:
+        parser.error("--min-interval deve ser positivo e não maior que --max-interval")
+    
+    daemon = SyncDaemon(
+        args.clients or None,
+        workers=args.workers,
+        dry_run=args.dry_run,
+        hours_back=args.hours,
+        metrics_dir=args.metrics,
+        skip_health_check=args.skip_health_check,
+        min_interval=args.min_interval,
+        max_interval=args.max_interval,
+        start_interval=args.interval,
+        busy_threshold=args.busy_threshold
+    )
+    # SIGTERM (systemd, docker stop) encerra como Ctrl+C
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    daemon.run_forever()
+
+def backfill_command(argv):
+    """Sincronização histórica retomável, em janelas paralelas"""
+    from datetime import timedelta
+    from schemas.state import connect_state_db
+    from services.backfill import BackfillRunner, DEFAULT_WINDOW_HOURS, DEFAULT_PARALLEL
+    from utils.timerange import BackfillCheckpoint, TimeWindow, align_to_window, parse_timestamp, utc_now
+    
+    parser = argparse.ArgumentParser(
+        prog="main.py backfill",
+        description="Sincroniza um intervalo histórico em janelas paralelas, retomando de onde parou"
+    )
+    parser.add_argument("client", help="Nome do cliente (ex: grupo_multi)")
+    parser.add_argument("--from", dest="start", required=True, type=parse_timestamp,
+                        help="Início do intervalo (ISO 8601, ex: 2024-01-01 ou 2024-01-01T12:00:00Z; UTC)")
+    parser.add_argument("--to", dest="end", type=parse_timestamp,
+                        help="Fim do intervalo, exclusivo (padrão: último limite de janela antes de agora)")
+    parser.add_argument("--window-hours", type=float, default=DEFAULT_WINDOW_HOURS,
+                        help=f"Tamanho de cada janela em horas (padrão: {DEFAULT_WINDOW_HOURS})")
+    parser.add_argument("--parallel", type=int, default=DEFAULT_PARALLEL,
+                        help=f"Janelas processadas ao mesmo tempo (padrão: {DEFAULT_PARALLEL})")
+    parser.add_argument("--workers", type=int, default=1, help="Tickets processados em paralelo por janela")
+    parser.add_argument("--restart", action="store_true",
+                        help="Descartar os checkpoints do intervalo e refazer todas as janelas")
+    parser.add_argument("--metrics", metavar="DIR", help="Gravar relatório de métricas ao final")
+    parser.add_argument("--skip-health-check", action="store_true",
+                        help="Não testar as conexões antes de começar")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Apenas simular (não executar mudanças nem gravar checkpoints)")
+    args = parser.parse_args(argv)
+    
+    if args.window_hours <= 0:
+        parser.error("--window-hours deve ser positivo")
+    window_size = timedelta(hours=args.window_hours)
+    
+    end = args.end
+    if end is None:
+        # Só janelas completas: o restante até agora fica para a sincronização normal
+        end = align_to_window(args.start, utc_now(), window_size)
+        if end <= args.start:
+            parser.error("intervalo menor que uma janela: informe --to ou reduza --window-hours")
+        print(f"📅 Sem --to: backfill até {end.isoformat()} (último limite de janela)")
+    span = TimeWindow(args.start, end)
+    if span.start >= span.end:
+        parser.error("--from deve ser anterior a --to")
+    
+    sync_service = create_sync_service(args.client, workers=args.workers)
+    sync_service.set_dry_run(args.dry_run)
+    if args.skip_health_check:
+        sync_service.skip_health_check = True
+    
+    checkpoint = BackfillCheckpoint(connect_state_db(args.client))
+    if args.restart:
+        print(f"♻️ {checkpoint.clear(span)} checkpoints descartados")
+    
+    runner = BackfillRunner(sync_service, checkpoint, window_size, args.parallel)
+    try:
+        totals = runner.run(span)
+    except ConnectionError as e:
+        logger.error(f"❌ {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n🛑 Interrompido - rode o mesmo comando para continuar")
+        sys.exit(130)
+    finally:
+        if args.metrics:
+            write_report(sync_service.metrics, args.metrics, args.client)
+    
+    flush_logs()
+    print(f"\n📊 BACKFILL {args.client}: {totals['windows_done']} janelas concluídas, "
+          f"{totals['windows_incomplete']} incompletas")
+    print(f"   ✅ {totals['success']} sucessos, ❌ {totals['failed']} falhas, ⏭️ {totals['skipped']} pulados")
+    if totals['windows_incomplete']:
+        print("   🔁 Rode o mesmo comando para reprocessar as janelas incompletas")
+        sys.exit(1)
+
+def reconcile_command(argv):
+    """Verificação completa: transiciona só as issues com status divergente"""
+    from utils.timerange import parse_timestamp
+    
+    parser = argparse.ArgumentParser(
+        prog="main.py reconcile",
+        description="Compara o status de todos os tickets relevantes com o das issues e corrige só as divergências"
+    )
+    parser.add_argument("client", help="Nome do cliente (ex: grupo_multi)")
+    parser.add_argument("--since", type=parse_timestamp,
+                        help="Considerar só tickets atualizados desde esta data (padrão: todo o histórico)")
+    parser.add_argument("--workers", type=int, default=1, help="Transições individuais em paralelo")
+    parser.add_argument("--metrics", metavar="DIR", help="Gravar relatório de métricas ao final")
+    parser.add_argument("--skip-health-check", action="store_true",
+                        help="Não testar as conexões antes de começar")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas simular (não executar mudanças)")
+    args = parser.parse_args(argv)
+    
+    sync_service = create_sync_service(args.client, workers=args.workers)
+    sync_service.set_dry_run(args.dry_run)
+    if args.skip_health_check:
+        sync_service.skip_health_check = True
+    
+    try:
+        report = sync_service.reconcile(args.since)
+    except Exception as e:
+        logger.error(f"❌ Reconciliação interrompida: {e}")
+        sys.exit(1)
+    finally:
+        if args.metrics:
+            write_report(sync_service.metrics, args.metrics, args.client)
+    
+    flush_logs()
+    mode = "SIMULAÇÃO" if args.dry_run else "EXECUÇÃO REAL"
+    print(f"\n⚖️ RECONCILIAÇÃO ({mode}) - {args.client}")
+    print(f"   📋 {report['tickets']} tickets, {report['issues']} issues no projeto")
+    print(f"   ✅ Em dia: {report['in_sync']}")
+    print(f"   🔁 Divergentes: {report['drift']} ({report['success']} corrigidas, {report['failed']} falhas)")
+    print(f"   ⛔ Sem transição disponível: {report['blocked']}")
+    print(f"   ❓ Sem issue conhecida: {report['unmapped']} (ficam para a sincronização normal)")
+    if report['failed']:
+        sys.exit(1)
+
+# Subcomandos: `main.py <comando> ...`; qualquer outro primeiro argumento é um cliente
+COMMANDS = {
+    'serve': serve_command,
+    'retries': retries_command,
+    'daemon': daemon_command,
+    'backfill': backfill_command,
+    'reconcile': reconcile_command,
+}
+
 def main():
     """Função principal"""
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        COMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+    
     parser = argparse.ArgumentParser(description="Sistema de Sincronização Multi-Cliente")
     parser.add_argument(
         "client",
@@ -165,15 +468,56 @@ def main():
         default=24,
         help="Horas atrás para buscar tickets (padrão: 24)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Tickets processados em paralelo (padrão: 1, sequencial)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Buscar só o que mudou desde a última execução bem-sucedida (--hours vale na primeira vez)"
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Sincronizar todos os clientes de config/ num só processo"
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="DIR",
+        help="Gravar relatório de métricas do cliente em DIR (<cliente>.json e <cliente>.prom)"
+    )
+    parser.add_argument(
+        "--skip-health-check",
+        action="store_true",
+        help="Não testar as conexões antes de sincronizar (também: SYNC_SKIP_HEALTH_CHECK=1)"
+    )
+    
+    parser.add_argument(
+        "--check-config",
+        action="store_true",
+        help="Validar a configuração de todos os clientes de config/ e sair"
+    )
     
     args = parser.parse_args()
     
+    if args.check_config:
+        check_client_configs()
+        return
+    
+    if args.all:
+        run_all_clients(args)
+        return
+    
     # Se não especificou cliente, perguntar
     if not args.client:
         print("🔧 SISTEMA DE SINCRONIZAÇÃO MULTI-CLIENTE")
         print("=" * 50)
         print("📁 Clientes disponíveis:")
-        print("   • grupo_multi")
+        for client_name in discover_clients():
+            print(f"   • {client_name}")
         print("   • (adicione mais em config/)")
         
         args.client = input("\n💭 Digite o nome do cliente: ").strip()
@@ -188,23 +532,38 @@ def main():
         # Execução automática via linha de comando
         print(f"🤖 Execução automática para cliente: {args.client}")
         
-        sync_service = create_sync_service(args.client)
+        sync_service = create_sync_service(args.client, workers=args.workers)
         
-        if not test_connections(sync_service):
+        if args.skip_health_check:
+            sync_service.skip_health_check = True
+        elif not test_connections(sync_service):
             print("❌ Falha nas conexões. Abortando.")
             sys.exit(1)
         
         sync_service.set_dry_run(args.dry_run)
         
         mode = "SIMULAÇÃO" if args.dry_run else "EXECUÇÃO REAL"
-        print(f"\n🚀 {mode} - Últimas {args.hours}h")
         
-        stats = sync_service.sync_all_tickets(args.hours)
+        if args.incremental:
+            print(f"\n🚀 {mode} - Incremental (desde a última execução)")
+            stats = sync_service.sync_incremental(args.hours)
+        else:
+            print(f"\n🚀 {mode} - Últimas {args.hours}h")
+            stats = sync_service.sync_all_tickets(args.hours)
+        flush_logs()
         
-        print(f"\n📊 RESULTADO FINAL:")
+        print("\n📊 RESULTADO FINAL:")
         print(f"   ✅ Sucessos: {stats['success']}")
         print(f"   ❌ Falhas: {stats['failed']}")
+        print(f"   ⏭️ Pulados: {stats['skipped']}")
         print(f"   📈 Taxa de sucesso: {stats['success']/(stats['success']+stats['failed'])*100:.1f}%" if (stats['success']+stats['failed']) > 0 else "   📈 Nenhum ticket processado")
+        
+        connections = sync_service.jira.connection_stats()
+        print(f"   🔌 Conexões Jira: {connections['opened']} abertas, {connections['reused']} reutilizadas ({connections['requests']} requisições)")
+        
+        if args.metrics:
+            json_path, prom_path = write_report(sync_service.metrics, args.metrics, args.client, stats=stats)
+            print(f"   📈 Métricas: {json_path}, {prom_path}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
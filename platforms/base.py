@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Base comum dos clientes HTTP (Freshdesk, Jira)
+"""
+import hashlib
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+
+from settings import HEALTH_CHECK_TTL
+from utils.metrics import MetricsRegistry, API_REQUESTS, API_SECONDS, RATE_LIMIT_SLEEP, endpoint_label
+from utils.ratelimit import get_limiter, RATE_LIMIT_RETRIES
+
+# Último teste de conexão por (provedor, URL base, hash da credencial): (instante, resultado)
+_health_cache = {}
+_health_lock = threading.Lock()
+
+
+class BaseAPIClient:
+    """Envio de requisições com limite de concorrência e rate limit por host"""
+    
+    # Rótulo do provedor nas métricas
+    provider = 'api'
+    # Janela (s) da cota de X-RateLimit-Total/Limit, se o provedor não informar a taxa
+    rate_limit_window: Optional[float] = None
+    
+    def __init__(self, base_url: str, session: requests.Session, max_concurrency: int,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.base_url = base_url
+        self.session = session
+        self.limiter = get_limiter(urlparse(base_url).netloc, self.rate_limit_window)
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        
+        # Limite de chamadas simultâneas ao provedor (modo concorrente)
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        
+        # Contadores de tráfego (chamadas e bytes de payload recebidos)
+        self._traffic = {'calls': 0, 'bytes': 0}
+        self._traffic_lock = threading.Lock()
+    
+    def test_connection(self) -> bool:
+        raise NotImplementedError
+    
+    def _auth_identity(self) -> str:
+        """Credencial do cliente; entra só como hash na chave do cache de saúde"""
+        return ''
+    
+    def check_health(self, ttl: float = HEALTH_CHECK_TTL, force: bool = False) -> bool:
+        """test_connection() com resultado em cache no processo
+
+        Clientes do mesmo provedor, URL e credencial compartilham o
+        resultado (um token revogado não herda o sucesso de outro); só
+        sucessos ficam em cache, então uma falha é testada de novo.
+        """
+        identity = hashlib.sha256(self._auth_identity().encode('utf-8')).hexdigest()
+        key = (self.provider, self.base_url, identity)
+        with _health_lock:
+            cached = _health_cache.get(key)
+        if not force and cached and time.monotonic() - cached[0] < ttl:
+            return True
+        
+        healthy = self.test_connection()
+        with _health_lock:
+            if healthy:
+                _health_cache[key] = (time.monotonic(), True)
+            else:
+                _health_cache.pop(key, None)
+        return healthy
+    
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Requisição única; subclasses podem acrescentar autenticação"""
+        return self.session.request(method, url, **kwargs)
+    
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Executa chamada HTTP respeitando concorrência e cota da API
+
+        Respostas 429 são repetidas após o tempo pedido em `Retry-After`.
+        """
+        url = f"{self.base_url}{path}"
+        endpoint = f"{method} {endpoint_label(path)}"
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            slept = self.limiter.acquire()
+            if slept:
+                self.metrics.inc(RATE_LIMIT_SLEEP, slept, provider=self.provider)
+            
+            with self._slots:
+                started = time.perf_counter()
+                try:
+                    response = self._send(method, url, **kwargs)
+                except requests.RequestException:
+                    self.metrics.inc(API_REQUESTS, provider=self.provider, endpoint=endpoint, status='error')
+                    raise
+                finally:
+                    self.metrics.observe(API_SECONDS, time.perf_counter() - started,
+                                         provider=self.provider, endpoint=endpoint)
+            self.metrics.inc(API_REQUESTS, provider=self.provider, endpoint=endpoint,
+                             status=response.status_code)
+            self.limiter.update_from_response(response)
+            self._count_traffic(response)
+            
+            if response.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                return response
+        return response
+    
+    def _count_traffic(self, response: requests.Response):
+        with self._traffic_lock:
+            self._traffic['calls'] += 1
+            self._traffic['bytes'] += len(response.content or b'')
+    
+    def traffic_stats(self) -> dict:
+        """Chamadas feitas e bytes recebidos desde a criação do cliente"""
+        with self._traffic_lock:
+            return dict(self._traffic)
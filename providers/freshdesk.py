@@ -4,18 +4,49 @@ Cliente para API do Freshdesk
 """
 import requests
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator, Iterable
+from urllib.parse import urlparse, parse_qs
 
-class FreshdeskClient:
+from platforms.base import BaseAPIClient
+from schemas.ticket import Ticket, parse_ticket_page
+from utils.logger import get_logger
+from utils.metrics import MetricsRegistry
+from utils.timerange import format_timestamp, parse_timestamp, utc_now
+
+logger = get_logger()
+
+TICKETS_PER_PAGE = 100
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Limites da API de busca (/search/tickets): 30 por página, até 10 páginas
+SEARCH_PAGE_SIZE = 30
+SEARCH_MAX_PAGES = 10
+SEARCH_QUERY_MAX_CHARS = 512
+
+def _updated_within(ticket: Ticket, start: Optional[datetime], end: Optional[datetime]) -> bool:
+    """updated_at em [start, end) (tickets sem updated_at passam)"""
+    if not ticket.updated_at:
+        return True
+    updated = parse_timestamp(ticket.updated_at)
+    return (start is None or updated >= start) and (end is None or updated < end)
+
+class FreshdeskClient(BaseAPIClient):
     """Cliente para acessar API do Freshdesk"""
     
-    def __init__(self, domain: str, api_key: str):
+    provider = 'freshdesk'
+    rate_limit_window = 60.0  # X-RateLimit-Total do Freshdesk é a cota por minuto
+    
+    def __init__(self, domain: str, api_key: str, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 base_url: Optional[str] = None, metrics: Optional[MetricsRegistry] = None):
         self.domain = domain
         self.api_key = api_key
-        self.base_url = self._build_url(domain)
         
-        self.session = requests.Session()
-        self.session.auth = (api_key, 'X')
+        session = requests.Session()
+        session.auth = (api_key, 'X')
+        
+        # base_url substitui https://<domínio>.freshdesk.com/api/v2 (ex: servidor local de benchmark)
+        super().__init__(base_url.rstrip('/') if base_url else self._build_url(domain), session, max_concurrency,
+                         metrics)
     
     def _build_url(self, domain: str) -> str:
         """Constrói URL base do Freshdesk"""
@@ -27,11 +58,14 @@ class FreshdeskClient:
             
         return f"https://{domain}/api/v2"
     
+    def _auth_identity(self) -> str:
+        return self.api_key
+    
     def test_connection(self) -> bool:
         """Testa conexão com Freshdesk"""
         try:
-            response = self.session.get(
-                f"{self.base_url}/tickets",
+            response = self._request(
+                "GET", "/tickets",
                 params={'per_page': 1},
                 timeout=10
             )
@@ -39,37 +73,158 @@ class FreshdeskClient:
         except Exception:
             return False
     
-    def get_tickets(self, updated_since_hours: int = 24) -> List[Dict]:
-        """Busca tickets atualizados"""
-        try:
-            since_time = (datetime.now() - timedelta(hours=updated_since_hours)).isoformat()
+    def iter_ticket_pages(self, updated_since_hours: int = 24, updated_since: Optional[datetime] = None,
+                          updated_before: Optional[datetime] = None) -> Iterator[List[Ticket]]:
+        """Itera páginas de tickets atualizados, ordenados por updated_at
+
+        Paginação por chave: cada página é pedida a partir do updated_at do
+        último ticket recebido, descartando os ids já vistos nesse instante.
+        Só com `page`, um ticket atualizado durante a execução vai para o fim
+        da ordenação, desloca os seguintes e um deles nunca é entregue.
+        Erros HTTP no meio da paginação são propagados para não truncar a janela.
+        Cada item da página é decodificado e reduzido a Ticket em sequência,
+        sem manter os dicts completos da página. Com `updated_before`, a
+        paginação para no primeiro ticket que passa do fim da janela.
+        """
+        if updated_since is None:
+            updated_since = utc_now() - timedelta(hours=updated_since_hours)
+        
+        params = {
+            'updated_since': format_timestamp(updated_since),
+            'order_by': 'updated_at',
+            'order_type': 'asc',
+            'per_page': TICKETS_PER_PAGE,
+            'page': 1
+        }
+        # Ids já entregues com updated_at igual ao cursor (reaparecem na próxima consulta)
+        seen_at_cursor = set()
+        
+        while True:
+            response = self._request(
+                "GET", "/tickets",
+                params=params,
+                timeout=30
+            )
+            response.raise_for_status()
+            
+            received = parse_ticket_page(response.text)
+            if not received:
+                return
             
-            response = self.session.get(
-                f"{self.base_url}/tickets",
-                params={
-                    'updated_since': since_time,
-                    'per_page': 100
-                },
+            cursor = params['updated_since']
+            page = [t for t in received if not (t.updated_at == cursor and t.id in seen_at_cursor)]
+            
+            if updated_before is not None:
+                bounded = [t for t in page if _updated_within(t, None, updated_before)]
+                if bounded:
+                    yield bounded
+                if len(bounded) < len(page):
+                    return
+            elif page:
+                yield page
+            
+            next_page = self._next_page(response)
+            if next_page is None or len(received) < TICKETS_PER_PAGE:
+                return
+            
+            last_updated = received[-1].updated_at
+            if last_updated and last_updated != cursor:
+                params['updated_since'] = last_updated
+                params['page'] = 1
+                seen_at_cursor = set()
+            else:
+                # Página inteira no mesmo instante (ou sem updated_at): só avançando a página
+                params['page'] += 1
+            seen_at_cursor.update(t.id for t in received if t.updated_at == params['updated_since'])
+    
+    def _next_page(self, response: requests.Response) -> Optional[int]:
+        """Extrai o número da próxima página do cabeçalho Link"""
+        next_url = response.links.get('next', {}).get('url')
+        if not next_url:
+            return None
+        
+        page = parse_qs(urlparse(next_url).query).get('page')
+        return int(page[0]) if page else None
+    
+    def iter_filtered_ticket_pages(self, statuses: Iterable[int], updated_since_hours: int = 24,
+                                   updated_since: Optional[datetime] = None,
+                                   updated_before: Optional[datetime] = None) -> Iterator[List[Ticket]]:
+        """Itera só os tickets com os status informados, filtrando no servidor
+
+        Usa a API de busca (`status` + `updated_at`). Como ela aceita apenas
+        datas e devolve no máximo 300 resultados, o horário exato é filtrado
+        localmente e, se a consulta não couber nesses limites, cai para o
+        endpoint de listagem com filtro local de status.
+        """
+        if updated_since is None:
+            updated_since = utc_now() - timedelta(hours=updated_since_hours)
+        statuses = sorted(set(statuses))
+        
+        status_clause = ' OR '.join(f'status:{status}' for status in statuses)
+        query = f"({status_clause}) AND updated_at:>'{updated_since.strftime('%Y-%m-%d')}'"
+        if updated_before is not None:
+            query += f" AND updated_at:<'{(updated_before + timedelta(days=1)).strftime('%Y-%m-%d')}'"
+        
+        first = self._search_tickets(query, 1) if statuses and len(query) <= SEARCH_QUERY_MAX_CHARS - 2 else None
+        if first is None or first.get('total', 0) > SEARCH_PAGE_SIZE * SEARCH_MAX_PAGES:
+            logger.info("🔎 Filtro no servidor indisponível para esta janela; usando listagem com filtro local")
+            wanted = set(statuses)
+            for page in self.iter_ticket_pages(updated_since=updated_since, updated_before=updated_before):
+                relevant = [ticket for ticket in page if ticket.status in wanted]
+                if relevant:
+                    yield relevant
+            return
+        
+        total_pages = min(SEARCH_MAX_PAGES, -(-first.get('total', 0) // SEARCH_PAGE_SIZE))
+        result = first
+        for page_number in range(1, total_pages + 1):
+            if page_number > 1:
+                result = self._search_tickets(query, page_number)
+                if result is None:
+                    raise requests.HTTPError(f"Falha na busca de tickets (página {page_number})")
+            
+            tickets = (Ticket.from_api(item) for item in result.get('results', []))
+            page = [ticket for ticket in tickets if _updated_within(ticket, updated_since, updated_before)]
+            if page:
+                yield page
+    
+    def _search_tickets(self, query: str, page: int) -> Optional[Dict]:
+        """Página da API de busca de tickets, ou None se a consulta falhar"""
+        try:
+            response = self._request(
+                "GET", "/search/tickets",
+                params={'query': f'"{query}"', 'page': page},
                 timeout=30
             )
             
             if response.status_code == 200:
                 return response.json()
-            return []
+            return None
+            
+        except Exception:
+            return None
+    
+    def get_tickets(self, updated_since_hours: int = 24) -> List[Ticket]:
+        """Busca tickets atualizados (todas as páginas)"""
+        try:
+            tickets = []
+            for page in self.iter_ticket_pages(updated_since_hours):
+                tickets.extend(page)
+            return tickets
             
         except Exception:
             return []
     
-    def get_ticket_by_id(self, ticket_id: int) -> Optional[Dict]:
+    def get_ticket_by_id(self, ticket_id: int) -> Optional[Ticket]:
         """Busca ticket específico por ID"""
         try:
-            response = self.session.get(
-                f"{self.base_url}/tickets/{ticket_id}",
+            response = self._request(
+                "GET", f"/tickets/{ticket_id}",
                 timeout=10
             )
             
             if response.status_code == 200:
-                return response.json()
+                return Ticket.from_api(response.json())
             return None
             
         except Exception:
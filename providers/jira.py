@@ -2,25 +2,90 @@
 """
 Cliente para API do Jira
 """
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
-from typing import Dict, Optional
+from typing import Dict, Iterator, List, Optional
+
+from platforms.base import BaseAPIClient
+from utils.metrics import MetricsRegistry
+
+DEFAULT_POOL_SIZE = 10
+SEARCH_PAGE_SIZE = 100
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Transição em lote (Jira Cloud): issues por requisição e espera pela tarefa assíncrona
+BULK_MAX_ISSUES = 1000
+BULK_POLL_INTERVAL = 0.25
+BULK_MAX_POLL_INTERVAL = 5.0
+BULK_TIMEOUT = 120
+BULK_DONE_STATUSES = ('COMPLETE', 'FAILED', 'CANCELLED', 'DEAD')
+
+# Únicos campos lidos pela sincronização; todas as leituras pedem só estes
+ISSUE_FIELDS = "summary,status,created,issuetype,project"
+
+class JiraSearchError(ConnectionError):
+    """Falha numa busca JQL (status_code None para erros de rede)"""
+    
+    def __init__(self, status_code: Optional[int], message: str):
+        super().__init__(f"{message} [HTTP {status_code}]" if status_code else message)
+        self.status_code = status_code
+
+def create_jira_adapter(pool_size: int = DEFAULT_POOL_SIZE) -> HTTPAdapter:
+    """Pool de conexões keep-alive para um site Jira (compartilhável entre sessões)"""
+    return HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
 
-class JiraClient:
+def create_jira_session(pool_size: int = DEFAULT_POOL_SIZE, adapter: Optional[HTTPAdapter] = None) -> requests.Session:
+    """Cria sessão HTTP com pool keep-alive para um site Jira
+
+    Com `adapter`, a sessão usa um pool já existente: clientes do mesmo
+    site reaproveitam conexões sem dividir cookies (cada credencial tem
+    a própria sessão e o próprio cookie jar).
+    """
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json", "Connection": "keep-alive"})
+    
+    if adapter is None:
+        adapter = create_jira_adapter(pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+class JiraClient(BaseAPIClient):
     """Cliente para acessar API do Jira"""
     
-    def __init__(self, base_url: str, email: str, api_token: str):
-        self.base_url = base_url
+    provider = 'jira'
+    
+    def __init__(self, base_url: str, email: str, api_token: str, pool_size: int = DEFAULT_POOL_SIZE,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY, session: Optional[requests.Session] = None,
+                 metrics: Optional[MetricsRegistry] = None):
         self.auth = HTTPBasicAuth(email, api_token)
-        self.headers = {"Content-Type": "application/json"}
+        
+        # Sessão com pool de conexões keep-alive reaproveitadas entre chamadas.
+        # Clientes do mesmo site Jira podem compartilhar o pool de conexões
+        # (ver create_jira_session); a autenticação vai em cada requisição
+        if session is None:
+            session = create_jira_session(pool_size)
+        super().__init__(base_url, session, max_concurrency, metrics)
+        self._adapter = self.session.get_adapter(base_url)
+        # Desligado na primeira recusa do endpoint de lote (ex: Jira Server/Data Center)
+        self.bulk_supported = True
+    
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Requisição com a autenticação deste cliente"""
+        kwargs.setdefault('auth', self.auth)
+        return self.session.request(method, url, **kwargs)
+    
+    def _auth_identity(self) -> str:
+        return f"{self.auth.username}:{self.auth.password}"
     
     def test_connection(self) -> bool:
         """Testa conexão com Jira"""
         try:
-            response = requests.get(
-                f"{self.base_url}/rest/api/3/myself",
-                headers=self.headers,
-                auth=self.auth,
+            response = self._request(
+                "GET", "/rest/api/3/myself",
                 timeout=10
             )
             return response.status_code == 200
@@ -30,10 +95,9 @@ class JiraClient:
     def get_issue(self, issue_key: str) -> Optional[Dict]:
         """Busca issue no Jira"""
         try:
-            response = requests.get(
-                f"{self.base_url}/rest/api/3/issue/{issue_key}",
-                headers=self.headers,
-                auth=self.auth,
+            response = self._request(
+                "GET", f"/rest/api/3/issue/{issue_key}",
+                params={'fields': ISSUE_FIELDS},
                 timeout=10
             )
             
@@ -44,15 +108,63 @@ class JiraClient:
         except Exception:
             return None
     
+    def search_issues(self, jql: str, max_results: int = 50, start_at: int = 0) -> Optional[Dict]:
+        """Executa busca JQL e retorna a página de resultados"""
+        try:
+            return self._search_page(jql, max_results, start_at)
+        except Exception:
+            return None
+    
+    def _search_page(self, jql: str, max_results: int, start_at: int) -> Dict:
+        """Página de busca JQL; levanta JiraSearchError em caso de falha"""
+        try:
+            response = self._request(
+                "GET", "/rest/api/3/search",
+                params={'jql': jql, 'maxResults': max_results, 'startAt': start_at, 'fields': ISSUE_FIELDS},
+                timeout=10
+            )
+        except requests.RequestException as e:
+            raise JiraSearchError(None, str(e)) from e
+        
+        if response.status_code != 200:
+            raise JiraSearchError(response.status_code, f"Falha na busca JQL (startAt={start_at})")
+        return response.json()
+    
+    def iter_search(self, jql: str, page_size: int = SEARCH_PAGE_SIZE) -> Iterator[Dict]:
+        """Itera todas as issues de uma busca JQL, seguindo a paginação"""
+        start_at = 0
+        while True:
+            result = self._search_page(jql, page_size, start_at)
+            
+            issues = result.get('issues', [])
+            yield from issues
+            
+            start_at += len(issues)
+            if not issues or start_at >= result.get('total', 0):
+                return
+    
+    def get_transitions(self, issue_key: str) -> Optional[List[Dict]]:
+        """Lista transições disponíveis para a issue"""
+        try:
+            response = self._request(
+                "GET", f"/rest/api/3/issue/{issue_key}/transitions",
+                timeout=10
+            )
+            
+            if response.status_code == 200:
+                return response.json().get('transitions', [])
+            return None
+            
+        except Exception:
+            return None
+    
     def transition_issue(self, issue_key: str, transition_id: str) -> bool:
         """Executa transição de status"""
         try:
             data = {"transition": {"id": transition_id}}
             
-            response = requests.post(
-                f"{self.base_url}/rest/api/3/issue/{issue_key}/transitions",
-                headers=self.headers,
-                auth=self.auth,
+            response = self._request(
+                "POST", f"/rest/api/3/issue/{issue_key}/transitions",
                 json=data,
                 timeout=10
             )
@@ -60,4 +172,105 @@ class JiraClient:
             return response.status_code == 204
             
         except Exception:
-            return False
\ No newline at end of file
+            return False
+    
+    def submit_bulk_transition(self, transitions: Dict[str, List[str]]) -> Optional[str]:
+        """Envia uma transição em lote ({transition_id: [issue_key]}); retorna o id da tarefa"""
+        try:
+            data = {
+                "bulkTransitionInputs": [
+                    {"selectedIssueIdsOrKeys": keys, "transitionId": transition_id}
+                    for transition_id, keys in transitions.items()
+                ],
+                # Mesmas notificações da transição individual, com ou sem lote
+                "sendBulkNotification": True
+            }
+            
+            response = self._request(
+                "POST", "/rest/api/3/bulk/issues/transition",
+                json=data,
+                timeout=30
+            )
+            
+            if response.status_code in (403, 404, 405):
+                self.bulk_supported = False
+                return None
+            if response.status_code not in (200, 201):
+                return None
+            return str(response.json().get('taskId') or '') or None
+            
+        except Exception:
+            return None
+    
+    def get_bulk_task(self, task_id: str) -> Optional[Dict]:
+        """Progresso de uma tarefa de operação em lote"""
+        try:
+            response = self._request(
+                "GET", f"/rest/api/3/bulk/queue/{task_id}",
+                timeout=10
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            return None
+            
+        except Exception:
+            return None
+    
+    def wait_bulk_task(self, task_id: str, timeout: float = BULK_TIMEOUT) -> Optional[Dict]:
+        """Consulta a tarefa até terminar (intervalo crescente); None se não terminou no prazo"""
+        deadline = time.monotonic() + timeout
+        interval = BULK_POLL_INTERVAL
+        task = None
+        while time.monotonic() < deadline:
+            time.sleep(interval)
+            task = self.get_bulk_task(task_id) or task
+            if task and task.get('status') in BULK_DONE_STATUSES:
+                return task
+            interval = min(interval * 2, BULK_MAX_POLL_INTERVAL)
+        return task
+    
+    def bulk_transition(self, transitions: Dict[str, List[Dict]],
+                        timeout: float = BULK_TIMEOUT) -> Optional[Dict[str, Optional[bool]]]:
+        """Transiciona issues em lote ({transition_id: [issue]}); retorna {issue_key: sucesso}
+        
+        A API informa as issues processadas pelo id numérico, por isso as
+        issues precisam ter 'id' e 'key'. Com a tarefa encerrada, issues
+        ausentes do resultado vêm como False; se ela não terminou no prazo,
+        vêm como None (o Jira ainda pode aplicá-las). None se o lote não
+        pôde ser enviado.
+        """
+        keys_by_id = {str(issue['id']): issue['key'] for issues in transitions.values() for issue in issues}
+        task_id = self.submit_bulk_transition({
+            transition_id: [issue['key'] for issue in issues]
+            for transition_id, issues in transitions.items() if issues
+        })
+        if task_id is None:
+            return None
+        
+        task = self.wait_bulk_task(task_id, timeout)
+        finished = bool(task) and task.get('status') in BULK_DONE_STATUSES
+        results: Dict[str, Optional[bool]] = {key: False if finished else None for key in keys_by_id.values()}
+        for issue_id in (task or {}).get('processedAccessibleIssues') or []:
+            key = keys_by_id.get(str(issue_id))
+            if key is not None:
+                results[key] = True
+        return results
+    
+    def connection_stats(self) -> Dict[str, int]:
+        """Conexões abertas vs reutilizadas pelo pool da sessão"""
+        opened = 0
+        requests_made = 0
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened += pool.num_connections
+            requests_made += pool.num_requests
+        
+        return {
+            'requests': requests_made,
+            'opened': opened,
+            'reused': max(requests_made - opened, 0)
+        }
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Registro do último status enviado ao Jira por ticket
+"""
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from schemas.state import state_lock
+
+
+@dataclass(frozen=True)
+class LedgerEntry:
+    """Último envio bem-sucedido de um ticket"""
+    ticket_id: int
+    freshdesk_status: int
+    updated_at: Optional[str]
+    issue_key: str
+    transition_id: str
+
+
+class SyncLedger:
+    """Ledger (ticket, status Freshdesk, updated_at, issue, transição) em SQLite"""
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self._lock = state_lock(conn)
+        
+        with self._lock, self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS sync_ledger (
+                       ticket_id INTEGER PRIMARY KEY,
+                       freshdesk_status INTEGER NOT NULL,
+                       updated_at TEXT,
+                       issue_key TEXT NOT NULL,
+                       transition_id TEXT NOT NULL,
+                       pushed_at TEXT NOT NULL
+                   )"""
+            )
+            rows = self._conn.execute(
+                "SELECT ticket_id, freshdesk_status, updated_at, issue_key, transition_id FROM sync_ledger"
+            ).fetchall()
+        
+        self._entries: Dict[int, LedgerEntry] = {row[0]: LedgerEntry(*row) for row in rows}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, ticket_id: int) -> Optional[LedgerEntry]:
+        """Último envio registrado para o ticket"""
+        return self._entries.get(ticket_id)
+    
+    def is_unchanged(self, ticket_id: int, freshdesk_status: int) -> bool:
+        """True se o status já foi enviado e não mudou desde então"""
+        entry = self._entries.get(ticket_id)
+        return entry is not None and entry.freshdesk_status == freshdesk_status
+    
+    def record(self, ticket_id: int, freshdesk_status: int, updated_at: Optional[str],
+               issue_key: str, transition_id: str):
+        """Registra um envio bem-sucedido"""
+        entry = LedgerEntry(ticket_id, freshdesk_status, updated_at, issue_key, transition_id)
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_ledger "
+                "(ticket_id, freshdesk_status, updated_at, issue_key, transition_id, pushed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (ticket_id, freshdesk_status, updated_at, issue_key, transition_id, now)
+            )
+            self._entries[ticket_id] = entry
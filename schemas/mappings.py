@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Índice persistente de mapeamento ticket Freshdesk → issue Jira
+"""
+import sqlite3
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from schemas.state import connect_state_db, state_lock
+
+
+class MappingIndex:
+    """Índice ticket → issue guardado em SQLite, com cópia em memória"""
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self._lock = state_lock(conn)
+        
+        with self._lock, self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS ticket_mappings (
+                       ticket_id INTEGER PRIMARY KEY,
+                       issue_key TEXT NOT NULL,
+                       strategy TEXT,
+                       updated_at TEXT NOT NULL
+                   )"""
+            )
+            rows = self._conn.execute("SELECT ticket_id, issue_key FROM ticket_mappings").fetchall()
+        
+        self._mappings: Dict[int, str] = {ticket_id: issue_key for ticket_id, issue_key in rows}
+        self._issue_keys = Counter(self._mappings.values())
+    
+    @classmethod
+    def for_client(cls, client_name: str) -> "MappingIndex":
+        """Abre o índice do cliente"""
+        return cls(connect_state_db(client_name))
+    
+    def __len__(self) -> int:
+        return len(self._mappings)
+    
+    def get(self, ticket_id: int) -> Optional[str]:
+        """Retorna a issue mapeada para o ticket, se houver"""
+        return self._mappings.get(ticket_id)
+    
+    def is_mapped(self, issue_key: str) -> bool:
+        """True se a issue já está mapeada para algum ticket"""
+        return self._issue_keys[issue_key] > 0
+    
+    def put(self, ticket_id: int, issue_key: str, strategy: str):
+        """Grava (ou substitui) o mapeamento confirmado"""
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ticket_mappings (ticket_id, issue_key, strategy, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (ticket_id, issue_key, strategy, now)
+            )
+            self._forget(ticket_id)
+            self._mappings[ticket_id] = issue_key
+            self._issue_keys[issue_key] += 1
+    
+    def invalidate(self, ticket_id: int):
+        """Remove o mapeamento (issue excluída ou movida)"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM ticket_mappings WHERE ticket_id = ?", (ticket_id,))
+            self._forget(ticket_id)
+    
+    def _forget(self, ticket_id: int):
+        issue_key = self._mappings.pop(ticket_id, None)
+        if issue_key is not None:
+            self._issue_keys[issue_key] -= 1
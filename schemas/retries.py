@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Fila persistente de novas tentativas para tickets que falharam
+"""
+import random
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Iterable
+
+from schemas.state import state_lock
+
+# Estado de uma entrada da fila
+RETRY_PENDING = 'pending'
+RETRY_DEAD = 'dead'
+
+DEFAULT_BASE_DELAY = 300       # segundos até a primeira nova tentativa
+DEFAULT_MAX_DELAY = 6 * 3600   # teto do backoff
+
+
+@dataclass(frozen=True)
+class RetryEntry:
+    """Ticket aguardando nova tentativa (ou descartado, se dead)"""
+    ticket_id: int
+    attempts: int
+    next_attempt_at: str
+    last_error: Optional[str]
+    state: str
+
+
+class RetryQueue:
+    """Fila de retry em SQLite com backoff exponencial, jitter e dead-letter
+
+    `attempts` conta as falhas do ticket; depois de `max_retries` novas
+    tentativas sem sucesso a entrada vira dead e só volta com replay().
+    """
+
+    def __init__(self, conn: sqlite3.Connection, max_retries: int = 3,
+                 base_delay: float = DEFAULT_BASE_DELAY, max_delay: float = DEFAULT_MAX_DELAY):
+        self._conn = conn
+        self._lock = state_lock(conn)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS retry_queue (
+                       ticket_id INTEGER PRIMARY KEY,
+                       attempts INTEGER NOT NULL,
+                       next_attempt_at TEXT NOT NULL,
+                       last_error TEXT,
+                       state TEXT NOT NULL,
+                       updated_at TEXT NOT NULL
+                   )"""
+            )
+            rows = self._conn.execute(
+                "SELECT ticket_id, attempts, next_attempt_at, last_error, state FROM retry_queue"
+            ).fetchall()
+
+        self._entries: Dict[int, RetryEntry] = {row[0]: RetryEntry(*row) for row in rows}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, ticket_id: int) -> bool:
+        return ticket_id in self._entries
+
+    def get(self, ticket_id: int) -> Optional[RetryEntry]:
+        return self._entries.get(ticket_id)
+
+    def entries(self, state: Optional[str] = None) -> List[RetryEntry]:
+        """Entradas da fila, das mais próximas de vencer às mais distantes"""
+        selected = [e for e in self._entries.values() if state is None or e.state == state]
+        return sorted(selected, key=lambda e: e.next_attempt_at)
+
+    def due(self, now: Optional[datetime] = None) -> List[int]:
+        """Tickets pendentes cuja próxima tentativa já venceu"""
+        now_iso = (now or datetime.now(timezone.utc)).isoformat()
+        return [e.ticket_id for e in self.entries(RETRY_PENDING) if e.next_attempt_at <= now_iso]
+
+    def backoff(self, attempts: int) -> float:
+        """Atraso após a n-ésima falha: exponencial com teto e jitter de até 50%"""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def record_failure(self, ticket_id: int, error: Optional[str] = None,
+                       now: Optional[datetime] = None) -> RetryEntry:
+        """Agenda a próxima tentativa (ou move para dead se esgotou as tentativas)"""
+        now = now or datetime.now(timezone.utc)
+        previous = self._entries.get(ticket_id)
+        attempts = (previous.attempts if previous else 0) + 1
+        state = RETRY_DEAD if attempts > self.max_retries else RETRY_PENDING
+        next_attempt = now + timedelta(seconds=self.backoff(attempts))
+
+        entry = RetryEntry(ticket_id, attempts, next_attempt.isoformat(), error, state)
+        self._write(entry, now)
+        return entry
+
+    def resolve(self, ticket_id: int):
+        """Remove o ticket da fila (sincronizado ou não precisa mais de envio)"""
+        if ticket_id not in self._entries:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM retry_queue WHERE ticket_id = ?", (ticket_id,))
+            self._entries.pop(ticket_id, None)
+
+    def replay(self, ticket_ids: Optional[Iterable[int]] = None, now: Optional[datetime] = None) -> List[int]:
+        """Torna as entradas vencidas agora, zerando as tentativas
+
+        Sem ids, reativa todas as entradas dead.
+        """
+        now = now or datetime.now(timezone.utc)
+        if ticket_ids is None:
+            ticket_ids = [e.ticket_id for e in self.entries(RETRY_DEAD)]
+
+        replayed = []
+        for ticket_id in ticket_ids:
+            entry = self._entries.get(ticket_id)
+            error = entry.last_error if entry else None
+            self._write(RetryEntry(ticket_id, 0, now.isoformat(), error, RETRY_PENDING), now)
+            replayed.append(ticket_id)
+        return replayed
+
+    def _write(self, entry: RetryEntry, now: datetime):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO retry_queue "
+                "(ticket_id, attempts, next_attempt_at, last_error, state, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (entry.ticket_id, entry.attempts, entry.next_attempt_at, entry.last_error,
+                 entry.state, now.isoformat())
+            )
+            self._entries[entry.ticket_id] = entry
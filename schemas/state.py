@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Banco SQLite de estado por cliente, compartilhado pelos stores (mapeamentos, ledger, retry, marca d'água)
+"""
+import os
+import sqlite3
+import threading
+
+from settings import STATE_DIR
+
+
+def state_db_path(client_name: str) -> str:
+    """Caminho do banco SQLite de estado do cliente"""
+    os.makedirs(STATE_DIR, exist_ok=True)
+    return os.path.join(STATE_DIR, f"{client_name}.sqlite3")
+
+
+class StateConnection(sqlite3.Connection):
+    """Conexão de estado com um único lock para todos os stores que a usam
+
+    Blocos `with conn:` de threads diferentes na mesma conexão se
+    atropelam (commit sem transação ativa, transação dentro de
+    transação); por isso mapeamentos, ledger, fila de retry, marca
+    d'água e checkpoints seguram `conn.lock` antes de usá-la.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lock = threading.RLock()
+
+
+def open_state_db(path: str) -> StateConnection:
+    """Abre um banco de estado compartilhável entre threads (':memory:' para testes e bench)"""
+    conn = sqlite3.connect(path, check_same_thread=False, factory=StateConnection)
+    if path != ':memory:':
+        conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def connect_state_db(client_name: str) -> StateConnection:
+    """Abre o banco de estado do cliente"""
+    return open_state_db(state_db_path(client_name))
+
+
+def state_lock(conn: sqlite3.Connection) -> threading.RLock:
+    """Lock compartilhado da conexão (exige conexão aberta por open_state_db)"""
+    lock = getattr(conn, 'lock', None)
+    if lock is None:
+        raise TypeError("Conexão de estado sem lock compartilhado: abra com open_state_db/connect_state_db")
+    return lock
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Modelo compacto de ticket do Freshdesk: só os campos lidos pela sincronização
+"""
+import json
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Mapping, Optional
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+@dataclass(frozen=True, slots=True)
+class Ticket:
+    """Ticket com id, status e datas; descrição, tags e campos customizados ficam de fora"""
+    id: int
+    status: int
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+    @classmethod
+    def from_api(cls, data: Mapping[str, Any]) -> 'Ticket':
+        """Monta o ticket a partir do JSON da API (levanta KeyError/ValueError se faltar id ou status)"""
+        return cls(
+            id=int(data['id']),
+            status=int(data['status']),
+            created_at=data.get('created_at'),
+            updated_at=data.get('updated_at')
+        )
+
+
+def iter_json_array(text: str) -> Iterator[Any]:
+    """Decodifica um array JSON elemento a elemento, sem montar a lista inteira"""
+    index = _skip_whitespace(text, 0)
+    if index >= len(text) or text[index] != '[':
+        raise ValueError("Resposta não é um array JSON")
+
+    index = _skip_whitespace(text, index + 1)
+    if index < len(text) and text[index] == ']':
+        return
+
+    while True:
+        item, index = _decoder.raw_decode(text, index)
+        yield item
+
+        index = _skip_whitespace(text, index)
+        if index >= len(text):
+            raise ValueError("Array JSON incompleto")
+        if text[index] == ']':
+            return
+        if text[index] != ',':
+            raise ValueError(f"Separador inesperado na posição {index}")
+        index = _skip_whitespace(text, index + 1)
+
+
+def _skip_whitespace(text: str, index: int) -> int:
+    while index < len(text) and text[index] in _WHITESPACE:
+        index += 1
+    return index
+
+
+def parse_ticket_page(text: str) -> List[Ticket]:
+    """Página da listagem de tickets: cada item vira Ticket assim que é decodificado"""
+    return [Ticket.from_api(item) for item in iter_json_array(text)]
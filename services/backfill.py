@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Backfill histórico: janelas de tempo processadas em paralelo, com checkpoint por janela
+"""
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from typing import Dict
+
+from services.sync import SyncService
+from utils.logger import get_logger
+from utils.timerange import BackfillCheckpoint, TimeWindow, split_window
+
+logger = get_logger()
+
+DEFAULT_WINDOW_HOURS = 24
+DEFAULT_PARALLEL = 2
+
+
+class BackfillRunner:
+    """Sincroniza um intervalo histórico dividido em janelas
+
+    Cada janela roda num serviço irmão (SyncService.spawn), então todas
+    passam pelos mesmos limites de taxa e pools dos clientes HTTP. Uma
+    janela só entra no checkpoint quando foi percorrida inteira; ao
+    repetir o mesmo comando, as concluídas são puladas.
+    """
+
+    def __init__(self, service: SyncService, checkpoint: BackfillCheckpoint,
+                 window_size: timedelta = timedelta(hours=DEFAULT_WINDOW_HOURS), parallel: int = DEFAULT_PARALLEL):
+        self.service = service
+        self.checkpoint = checkpoint
+        self.window_size = window_size
+        self.parallel = max(1, parallel)
+
+    def run(self, span: TimeWindow) -> Dict[str, int]:
+        """Processa as janelas pendentes; retorna os totais e as janelas concluídas/incompletas"""
+        windows = split_window(span, self.window_size)
+        pending = self.checkpoint.pending(windows)
+        totals = {"success": 0, "failed": 0, "skipped": 0, "windows_done": 0, "windows_incomplete": 0}
+
+        logger.info("🗄️ Backfill %s: %d janelas, %d já concluídas, %d em paralelo",
+                    span, len(windows), len(windows) - len(pending), self.parallel)
+        if not pending:
+            return totals
+
+        self.service.check_connections()
+        self.service.ensure_preflight()
+
+        # Um serviço por janela em andamento; devolvido ao pool quando ela termina
+        services: "queue.Queue[SyncService]" = queue.Queue()
+        services.put(self.service)
+        for _ in range(min(self.parallel, len(pending)) - 1):
+            services.put(self.service.spawn())
+
+        executor = ThreadPoolExecutor(max_workers=self.parallel, thread_name_prefix="backfill")
+        futures = {executor.submit(self._run_window, services, window): window for window in pending}
+        try:
+            for future in as_completed(futures):
+                window = futures[future]
+                try:
+                    stats, complete = future.result()
+                except Exception as e:
+                    logger.error("❌ Janela %s falhou: %s", window, e)
+                    totals["windows_incomplete"] += 1
+                    continue
+
+                for key in ("success", "failed", "skipped"):
+                    totals[key] += stats[key]
+                if complete:
+                    totals["windows_done"] += 1
+                else:
+                    totals["windows_incomplete"] += 1
+        except KeyboardInterrupt:
+            logger.warning("🛑 Backfill interrompido: janelas em andamento terminam, as demais ficam para a próxima")
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+        finally:
+            executor.shutdown(wait=True)
+
+        logger.info("🏁 Backfill: %d janelas concluídas, %d incompletas - %s sucessos, %s falhas, %s pulados",
+                    totals["windows_done"], totals["windows_incomplete"],
+                    totals["success"], totals["failed"], totals["skipped"])
+        return totals
+
+    def _run_window(self, services: "queue.Queue[SyncService]", window: TimeWindow):
+        service = services.get()
+        started = time.monotonic()
+        try:
+            logger.info("🕒 Janela %s", window)
+            stats = service.sync_window(window)
+            complete = service.fetch_complete
+        finally:
+            services.put(service)
+
+        if complete:
+            if not service.dry_run:
+                self.checkpoint.mark_done(window, stats)
+            logger.info("✅ Janela %s concluída em %.1fs: %s", window, time.monotonic() - started, stats)
+        else:
+            logger.warning("⚠️ Janela %s incompleta: fica pendente para a próxima execução", window)
+        return stats, complete
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Motor multi-cliente: sincroniza todos os clientes de config/ num só processo
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional, Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from providers.jira import create_jira_adapter, create_jira_session, DEFAULT_POOL_SIZE
+from services.factory import build_sync_service
+from settings import ClientConfig, discover_clients, load_client_config
+from utils.logger import get_logger
+from utils.metrics import write_report
+
+logger = get_logger()
+
+
+class MultiTenantEngine:
+    """Executa a sincronização de vários clientes em paralelo num event loop
+
+    Cada cliente roda numa thread do executor padrão (os clientes HTTP são
+    síncronos); o event loop só coordena. Clientes do mesmo site Jira
+    compartilham o pool de conexões, mas cada um tem a própria sessão:
+    cookies do Jira (JSESSIONID, XSRF) nunca passam de um tenant a outro.
+    """
+
+    def __init__(self, client_names: Optional[List[str]] = None, workers: int = 1, dry_run: bool = True,
+                 incremental: bool = False, metrics_dir: Optional[str] = None, skip_health_check: bool = False):
+        self.client_names = client_names if client_names is not None else discover_clients()
+        self.workers = workers
+        self.dry_run = dry_run
+        self.incremental = incremental
+        self.metrics_dir = metrics_dir
+        self.skip_health_check = skip_health_check
+        self._jira_adapters: Dict[str, HTTPAdapter] = {}
+
+    def _jira_session_for(self, config: ClientConfig) -> requests.Session:
+        """Sessão própria do cliente, sobre o pool compartilhado do site Jira"""
+        site = config.jira_base_url.rstrip('/').lower()
+        if site not in self._jira_adapters:
+            self._jira_adapters[site] = create_jira_adapter(config.jira_pool_size or DEFAULT_POOL_SIZE)
+        return create_jira_session(adapter=self._jira_adapters[site])
+
+    def _sync_client(self, client_name: str, config: ClientConfig, jira_session: requests.Session,
+                     hours_back: int) -> Dict[str, int]:
+        """Sincronização de um cliente (roda fora do event loop)"""
+        service = build_sync_service(
+            client_name,
+            workers=self.workers,
+            config=config,
+            jira_session=jira_session
+        )
+        service.set_dry_run(self.dry_run)
+        if self.skip_health_check:
+            service.skip_health_check = True
+        if self.incremental:
+            stats = service.sync_incremental(hours_back)
+        else:
+            stats = service.sync_all_tickets(hours_back)
+        
+        if self.metrics_dir:
+            write_report(service.metrics, self.metrics_dir, client_name, stats=stats)
+        return stats
+
+    async def _run_client(self, client_name: str, hours_back: int) -> Dict[str, Any]:
+        """Executa um cliente e captura falhas sem derrubar os demais"""
+        started = time.monotonic()
+        logger.info(f"🏢 [{client_name}] Iniciando sincronização")
+
+        try:
+            config = load_client_config(client_name)
+            # O pool é criado aqui, no event loop, para evitar corrida entre clientes
+            jira_session = self._jira_session_for(config)
+            stats = await asyncio.to_thread(self._sync_client, client_name, config, jira_session, hours_back)
+            result: Dict[str, Any] = dict(stats)
+        except Exception as e:
+            logger.error(f"❌ [{client_name}] Falha: {e}")
+            result = {"success": 0, "failed": 0, "skipped": 0, "error": str(e)}
+
+        result["elapsed"] = round(time.monotonic() - started, 2)
+        logger.info(f"🏁 [{client_name}] Concluído em {result['elapsed']}s")
+        return result
+
+    async def run(self, hours_back: int = 24) -> Dict[str, Dict[str, Any]]:
+        """Sincroniza todos os clientes concorrentemente"""
+        logger.info(f"🌐 Sincronização multi-cliente: {', '.join(self.client_names) or 'nenhum cliente'}")
+
+        results = await asyncio.gather(
+            *(self._run_client(name, hours_back) for name in self.client_names)
+        )
+        return dict(zip(self.client_names, results))
+
+    def run_all(self, hours_back: int = 24) -> Dict[str, Dict[str, Any]]:
+        """Ponto de entrada síncrono"""
+        return asyncio.run(self.run(hours_back))
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Montagem do serviço de sincronização a partir da configuração do cliente
+"""
+from typing import Optional
+
+import requests
+
+from providers.freshdesk import FreshdeskClient, DEFAULT_MAX_CONCURRENCY as FRESHDESK_MAX_CONCURRENCY
+from providers.jira import JiraClient, DEFAULT_POOL_SIZE, DEFAULT_MAX_CONCURRENCY as JIRA_MAX_CONCURRENCY
+from schemas.ledger import SyncLedger
+from schemas.mappings import MappingIndex
+from schemas.retries import RetryQueue, DEFAULT_BASE_DELAY, DEFAULT_MAX_DELAY
+from schemas.state import connect_state_db
+from services.sync import SyncService
+from settings import ClientConfig, load_client_config, get_settings
+from utils.metrics import MetricsRegistry
+from utils.timerange import HighWaterMark
+
+
+def build_sync_service(client_name: str, workers: int = 1, config: Optional[ClientConfig] = None,
+                       jira_session: Optional[requests.Session] = None) -> SyncService:
+    """Cria o SyncService do cliente (levanta exceção se a configuração falhar)"""
+    if config is None:
+        config = load_client_config(client_name)
+    
+    # Um registro por cliente, compartilhado pelos dois provedores e pelo serviço
+    metrics = MetricsRegistry()
+    
+    freshdesk_client = FreshdeskClient(
+        config.freshdesk_domain,
+        config.freshdesk_api_key,
+        max_concurrency=config.freshdesk_max_concurrency or FRESHDESK_MAX_CONCURRENCY,
+        base_url=config.freshdesk_base_url,
+        metrics=metrics
+    )
+    
+    jira_client = JiraClient(
+        config.jira_base_url,
+        config.jira_email,
+        config.jira_api_token,
+        pool_size=config.jira_pool_size or DEFAULT_POOL_SIZE,
+        max_concurrency=config.jira_max_concurrency or JIRA_MAX_CONCURRENCY,
+        session=jira_session,
+        metrics=metrics
+    )
+    
+    state_db = connect_state_db(client_name)
+    
+    return SyncService(
+        freshdesk_client,
+        jira_client,
+        config,
+        mappings=MappingIndex(state_db),
+        workers=workers,
+        watermark=HighWaterMark(state_db),
+        ledger=SyncLedger(state_db),
+        retries=RetryQueue(
+            state_db,
+            max_retries=config.max_retries if config.max_retries is not None else get_settings()['MAX_RETRIES'],
+            base_delay=config.retry_base_delay or DEFAULT_BASE_DELAY,
+            max_delay=config.retry_max_delay or DEFAULT_MAX_DELAY
+        ),
+        metrics=metrics
+    )
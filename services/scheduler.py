@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Daemon multi-cliente: mantém um SyncService aquecido por cliente e agenda cada um no próprio intervalo
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any
+
+from services.factory import build_sync_service
+from services.sync import SyncService
+from settings import DAEMON_MIN_INTERVAL, DAEMON_MAX_INTERVAL, DAEMON_START_INTERVAL, discover_clients
+from utils.logger import get_logger
+from utils.metrics import write_report
+
+logger = get_logger()
+
+# Tickets alterados numa execução a partir dos quais o cliente é considerado movimentado
+DEFAULT_BUSY_THRESHOLD = 20
+
+# Fatores aplicados ao intervalo: movimentado encolhe, ocioso ou com erro cresce
+SHRINK_FACTOR = 0.5
+GROW_FACTOR = 1.5
+ERROR_FACTOR = 2.0
+
+
+@dataclass
+class AdaptiveInterval:
+    """Intervalo entre execuções que acompanha a atividade do helpdesk
+
+    Muitos tickets alterados encolhem o intervalo pela metade; nenhum o
+    aumenta em 50%; falhas dobram. Fica sempre entre `minimum` e `maximum`.
+    """
+    current: float = DAEMON_START_INTERVAL
+    minimum: float = DAEMON_MIN_INTERVAL
+    maximum: float = DAEMON_MAX_INTERVAL
+    busy_threshold: int = DEFAULT_BUSY_THRESHOLD
+
+    def update(self, changed: int, error: bool = False) -> float:
+        """Ajusta e retorna o intervalo após uma execução"""
+        if error:
+            factor = ERROR_FACTOR
+        elif changed >= self.busy_threshold:
+            factor = SHRINK_FACTOR
+        elif changed == 0:
+            factor = GROW_FACTOR
+        else:
+            factor = 1.0
+        self.current = max(self.minimum, min(self.maximum, self.current * factor))
+        return self.current
+
+
+class ClientSchedule:
+    """Estado de um cliente no daemon: serviço aquecido, intervalo e última execução"""
+
+    def __init__(self, client_name: str, interval: AdaptiveInterval):
+        self.client_name = client_name
+        self.interval = interval
+        self.service: Optional[SyncService] = None
+        self.runs = 0
+        self.last_stats: Optional[Dict[str, int]] = None
+        self.last_error: Optional[str] = None
+        self.next_run_at = time.monotonic()
+
+
+class SyncDaemon:
+    """Sincronização contínua de vários clientes num processo de longa duração
+
+    Cada cliente roda na própria thread com o próprio SyncService (sessões
+    HTTP, cache de transições e índice de mapeamentos ficam quentes entre
+    execuções); um cliente lento ou fora do ar não atrasa os demais.
+    """
+
+    def __init__(self, client_names: Optional[List[str]] = None, workers: int = 1, dry_run: bool = True,
+                 hours_back: int = 24, metrics_dir: Optional[str] = None, skip_health_check: bool = False,
+                 min_interval: float = DAEMON_MIN_INTERVAL, max_interval: float = DAEMON_MAX_INTERVAL,
+                 start_interval: float = DAEMON_START_INTERVAL, busy_threshold: int = DEFAULT_BUSY_THRESHOLD):
+        self.client_names = client_names if client_names is not None else discover_clients()
+        self.workers = workers
+        self.dry_run = dry_run
+        self.hours_back = hours_back
+        self.metrics_dir = metrics_dir
+        self.skip_health_check = skip_health_check
+        self.schedules: Dict[str, ClientSchedule] = {
+            name: ClientSchedule(name, AdaptiveInterval(
+                current=max(min_interval, min(max_interval, start_interval)),
+                minimum=min_interval,
+                maximum=max_interval,
+                busy_threshold=busy_threshold
+            ))
+            for name in self.client_names
+        }
+        self._stop = threading.Event()
+
+    def _service_for(self, schedule: ClientSchedule) -> SyncService:
+        """SyncService do cliente, criado na primeira execução e reaproveitado depois"""
+        if schedule.service is None:
+            service = build_sync_service(schedule.client_name, workers=self.workers)
+            service.set_dry_run(self.dry_run)
+            if self.skip_health_check:
+                service.skip_health_check = True
+            schedule.service = service
+        return schedule.service
+
+    def run_once(self, schedule: ClientSchedule) -> float:
+        """Executa uma sincronização incremental do cliente; retorna o próximo intervalo"""
+        name = schedule.client_name
+        started = time.monotonic()
+        try:
+            service = self._service_for(schedule)
+            stats = service.sync_incremental(self.hours_back)
+        except Exception as e:
+            schedule.last_error = str(e)
+            interval = schedule.interval.update(0, error=True)
+            logger.error("❌ [%s] Falha na sincronização: %s - nova tentativa em %.0fs", name, e, interval)
+            return interval
+
+        schedule.runs += 1
+        schedule.last_stats = stats
+        schedule.last_error = None
+        changed = stats["success"] + stats["failed"]
+        interval = schedule.interval.update(changed)
+        logger.info("🏁 [%s] %d tickets alterados em %.1fs - próxima execução em %.0fs",
+                    name, changed, time.monotonic() - started, interval)
+
+        if self.metrics_dir:
+            try:
+                write_report(service.metrics, self.metrics_dir, name, stats=stats, interval=interval)
+            except OSError as e:
+                logger.warning("⚠️ [%s] Não foi possível gravar as métricas: %s", name, e)
+        return interval
+
+    def _client_loop(self, schedule: ClientSchedule):
+        while not self._stop.is_set():
+            interval = self.run_once(schedule)
+            schedule.next_run_at = time.monotonic() + interval
+            self._stop.wait(interval)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Resumo por cliente: execuções, intervalo atual, segundos até a próxima e último erro"""
+        now = time.monotonic()
+        return {
+            name: {
+                'runs': schedule.runs,
+                'interval': round(schedule.interval.current, 1),
+                'next_in': round(max(0.0, schedule.next_run_at - now), 1),
+                'last_stats': schedule.last_stats,
+                'last_error': schedule.last_error,
+            }
+            for name, schedule in self.schedules.items()
+        }
+
+    def run_forever(self):
+        """Inicia uma thread por cliente e bloqueia até Ctrl+C ou stop()"""
+        if not self.schedules:
+            logger.warning("⚠️ Nenhum cliente para sincronizar")
+            return
+
+        threads = [
+            threading.Thread(target=self._client_loop, args=(schedule,), name=f"daemon-{name}", daemon=True)
+            for name, schedule in self.schedules.items()
+        ]
+        for thread in threads:
+            thread.start()
+
+        logger.info("🛰️ Daemon iniciado: %s", ', '.join(self.schedules))
+        try:
+            while not self._stop.wait(1):
+                pass
+        except KeyboardInterrupt:
+            logger.info("👋 Encerrando daemon...")
+        finally:
+            self.stop()
+            # Execuções em andamento não são interrompidas; a espera por elas é limitada
+            for thread in threads:
+                thread.join(timeout=30)
+
+    def stop(self):
+        self._stop.set()
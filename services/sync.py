@@ -3,60 +3,133 @@
 """
 Serviço de sincronização automática - COM MAPEAMENTO INTELIGENTE
 """
+import re
+import threading
 import time
-import requests
-from typing import Dict, Optional, Any
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, Optional, Any, Tuple, Iterable, List
+from datetime import datetime, timedelta, timezone
 import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from providers.freshdesk import FreshdeskClient
-from providers.jira import JiraClient
-from utils.logger import get_logger
+from providers.jira import JiraClient, JiraSearchError, BULK_MAX_ISSUES
+from schemas.ledger import SyncLedger
+from schemas.mappings import MappingIndex
+from schemas.retries import RetryQueue, RETRY_DEAD
+from schemas.ticket import Ticket
+from services.transitions import (
+    TransitionCache, DEFAULT_TTL, CHECK_NOOP, CHECK_UNAVAILABLE
+)
+from settings import ClientConfig, SKIP_HEALTH_CHECK
+from utils.logger import get_logger, grouped_logs
+from utils.metrics import (
+    MetricsRegistry, PHASE_SECONDS, RATE_LIMIT_SLEEP, RESOLUTIONS, RESOLUTION_SECONDS, TICKETS, TICKET_SECONDS
+)
+from utils.prefetch import prefetch
+from utils.timerange import HighWaterMark, TimeWindow, incremental_window, utc_now
 
 logger = get_logger()
 
+# Estratégias de resolução ticket → issue
+STRATEGY_INDEX = 'index'
+STRATEGY_TAG = 'tag'
+STRATEGY_DATE = 'date'
+STRATEGY_TITLE = 'title'
+
+# Resultado do processamento de um ticket (chaves de stats)
+RESULT_SUCCESS = 'success'
+RESULT_FAILED = 'failed'
+RESULT_SKIPPED = 'skipped'
+# Transição adiada para o lote da página; o resultado final vem em flush_transitions
+RESULT_PENDING = 'pending'
+
+# Resolução em lote: termos por busca JQL, limitados pelo tamanho da URL
+FD_TAG_PATTERN = re.compile(r'\[FD-(\d+)\]')
+BATCH_JQL_MAX_CHARS = 2500
+
+# Issues recentes amostradas no preflight de transições
+PREFLIGHT_SAMPLE_SIZE = 50
+
+# Reconciliação sem --since: todo o histórico da conta Freshdesk
+RECONCILE_SINCE = datetime(2010, 1, 1, tzinfo=timezone.utc)
+
+# Transições em lote: grupos menores que isto saem mais baratos em chamadas individuais
+BULK_MIN_ISSUES = 3
+
+
+@dataclass(frozen=True)
+class PendingTransition:
+    """Transição validada aguardando o envio em lote da página"""
+    ticket: Ticket
+    issue: Dict[str, Any]
+    strategy: str
+    transition_id: str
+    started: float
+
 
 class SyncService:
     """Serviço de sincronização Freshdesk → Jira"""
     
-    def __init__(self, freshdesk_client: FreshdeskClient, jira_client: JiraClient, config: Dict):
+    def __init__(self, freshdesk_client: FreshdeskClient, jira_client: JiraClient, config: ClientConfig,
+                 mappings: Optional[MappingIndex] = None, workers: int = 1,
+                 watermark: Optional[HighWaterMark] = None, ledger: Optional[SyncLedger] = None,
+                 retries: Optional[RetryQueue] = None, metrics: Optional[MetricsRegistry] = None):
         self.freshdesk = freshdesk_client
         self.jira = jira_client
         self.config = config
-        self.jira_project_key = config.get('JIRA_PROJECT_KEY', 'LOGBEE')
+        self.mappings = mappings
+        self.watermark = watermark
+        self.ledger = ledger
+        self.retries = retries
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        self.jira_project_key = config.jira_project_key
         self.dry_run = True
+        self.workers = max(1, workers)
         
-        self._validate_config()
-        self._test_connections()
-    
-    def _validate_config(self):
-        """Valida configuração"""
-        required = ['FRESHDESK_TO_JIRA_TRANSITIONS', 'JIRA_PROJECT_KEY']
-        for key in required:
-            if key not in self.config:
-                raise ValueError(f"Configuração inválida: {key} não encontrado")
+        # Resultado da resolução em lote da execução atual
+        self._batch_checked = set()
+        self._batch_matches: Dict[int, Dict[str, Any]] = {}
+        self._retried = set()
+        self._stats_lock = threading.Lock()
+        self._fetch_complete = False
+        
+        # Transições adiadas da página atual (None: transição imediata)
+        self._pending: Optional[List[PendingTransition]] = None
+        self._pending_lock = threading.Lock()
+        
+        # Issues por dia de criação (estratégia 2) e issues já atribuídas na execução
+        self._day_issues: Dict[str, List[Dict[str, Any]]] = {}
+        self._day_locks: Dict[str, threading.Lock] = {}
+        self._day_locks_guard = threading.Lock()
+        self._claimed_keys = set()
+        self._claims_lock = threading.Lock()
+        # Com serviços irmãos (spawn) as atribuições valem para todos e não são limpas a cada janela
+        self._shared_claims = False
         
-        transitions = self.config.get('FRESHDESK_TO_JIRA_TRANSITIONS', {})
-        if not transitions:
-            raise ValueError("Nenhuma transição configurada")
+        self.transitions = TransitionCache(jira_client, ttl=config.transition_cache_ttl or DEFAULT_TTL)
+        self._preflight_done = False
         
-        logger.info(f"✅ Configuração validada - {len(transitions)} transições")
+        # Sem I/O aqui: as conexões são testadas na primeira sincronização (check_connections)
+        self.skip_health_check = SKIP_HEALTH_CHECK
+        
+        # A configuração já chega validada (settings.load_client_config)
+        logger.info(f"✅ Configuração validada - {len(config.transitions)} transições")
         logger.info(f"🎯 Projeto Jira: {self.jira_project_key}")
     
-    def _test_connections(self):
-        """Testa conexões"""
-        logger.info("🔌 Testando conexões...")
+    def check_connections(self, force: bool = False):
+        """Testa as conexões (em cache por HEALTH_CHECK_TTL); levanta ConnectionError"""
+        if self.skip_health_check and not force:
+            return
         
-        if not self.freshdesk.test_connection():
+        if not self.freshdesk.check_health(force=force):
             raise ConnectionError("Falha na conexão Freshdesk")
-        logger.info("✅ Conexão Freshdesk OK")
-        
-        if not self.jira.test_connection():
+        if not self.jira.check_health(force=force):
             raise ConnectionError("Falha na conexão Jira")
-        logger.info("✅ Conexão Jira OK")
+        logger.debug("✅ Conexões Freshdesk e Jira OK")
     
     def set_dry_run(self, dry_run: bool):
         """Define modo de execução"""
@@ -66,202 +139,833 @@ class SyncService:
     
     def find_corresponding_jira_issue(self, ticket_id: int) -> Optional[Dict[str, Any]]:
         """Encontra issue Jira correspondente usando múltiplas estratégias"""
-        logger.info(f"🔍 Buscando issue Jira para ticket #{ticket_id}")
+        issue, _ = self.resolve_jira_issue(ticket_id)
+        return issue
+    
+    def resolve_jira_issue(self, ticket_id: int, use_index: bool = True,
+                           ticket_data: Optional[Ticket] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Resolve a issue do ticket e informa qual estratégia encontrou
+
+        `ticket_data` é o ticket do Freshdesk já em mãos; evita buscar o
+        ticket de novo para a estratégia por data.
+        """
+        if use_index and self.mappings is not None:
+            issue_key = self.mappings.get(ticket_id)
+            self.metrics.inc(RESOLUTIONS, strategy=STRATEGY_INDEX, outcome='hit' if issue_key else 'miss')
+            if issue_key:
+                logger.debug("📇 Encontrado no índice: #%s → %s", ticket_id, issue_key)
+                # Se o lote já trouxe a issue atualizada, usa os campos dela
+                issue = self._batch_matches.get(ticket_id)
+                if issue and issue.get('key') == issue_key:
+                    return issue, STRATEGY_INDEX
+                return {'key': issue_key, 'fields': {}}, STRATEGY_INDEX
+        
+        issue, strategy = self._search_jira_issue(ticket_id, ticket_data)
+        
+        # Só o padrão [FD-X] é confirmação direta; as heurísticas são
+        # gravadas depois que a transição funciona (ver sync_single_ticket)
+        if issue and strategy == STRATEGY_TAG and self.mappings is not None:
+            self.mappings.put(ticket_id, issue['key'], strategy)
+        
+        return issue, strategy
+    
+    def _search_jira_issue(self, ticket_id: int,
+                           ticket_data: Optional[Ticket] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Busca a issue no Jira com as estratégias de JQL, na ordem"""
+        logger.debug("🔍 Buscando issue Jira para ticket #%s", ticket_id)
+        
+        strategies = (
+            (STRATEGY_TAG, self._match_by_tag),
+            (STRATEGY_DATE, self._match_by_date),
+            (STRATEGY_TITLE, self._match_by_title),
+        )
+        for strategy, match in strategies:
+            with self.metrics.timer(RESOLUTION_SECONDS, strategy=strategy):
+                issue = match(ticket_id, ticket_data)
+            self.metrics.inc(RESOLUTIONS, strategy=strategy, outcome='hit' if issue else 'miss')
+            if issue:
+                return issue, strategy
+        
+        logger.warning("❌ NENHUMA issue encontrada para ticket #%s", ticket_id)
+        return None, None
+    
+    def _match_by_tag(self, ticket_id: int, ticket_data: Optional[Ticket]) -> Optional[Dict[str, Any]]:
+        """ESTRATÉGIA 1: Buscar por padrão [FD-X] (para tickets 6, 7, 8)"""
+        if ticket_id in self._batch_checked:
+            issue = self._batch_matches.get(ticket_id)
+            if issue:
+                logger.debug("✅ Encontrado por padrão [FD-%s] (lote): %s", ticket_id, issue['key'])
+            return issue
         
-        # ESTRATÉGIA 1: Buscar por padrão [FD-X] (para tickets 6, 7, 8)
         try:
             jql = f'project = {self.jira_project_key} AND summary ~ "[FD-{ticket_id}]"'
-            response = requests.get(
-                f'{self.jira.base_url}/rest/api/3/search',
-                headers=self.jira.headers,
-                auth=self.jira.auth,
-                params={'jql': jql, 'maxResults': 1},
-                timeout=10
-            )
+            result = self.jira.search_issues(jql, max_results=1)
             
-            if response.status_code == 200:
-                issues = response.json().get('issues', [])
+            if result is not None:
+                issues = result.get('issues', [])
                 if issues:
                     issue = issues[0]
-                    logger.info(f"✅ Encontrado por padrão [FD-{ticket_id}]: {issue['key']}")
+                    logger.debug("✅ Encontrado por padrão [FD-%s]: %s", ticket_id, issue['key'])
                     return issue
         except Exception as e:
-            logger.error(f"❌ Erro na busca por padrão: {e}")
-        
-        # ESTRATÉGIA 2: Buscar por data de criação (para tickets novos)
+            logger.error("❌ Erro na busca por padrão: %s", e)
+        return None
+    
+    def _match_by_date(self, ticket_id: int, ticket_data: Optional[Ticket]) -> Optional[Dict[str, Any]]:
+        """ESTRATÉGIA 2: Buscar por data de criação (para tickets novos)"""
         try:
-            ticket_data = self.freshdesk.get_ticket_by_id(ticket_id)
-            if ticket_data and ticket_data.get('created_at'):
-                ticket_datetime = datetime.fromisoformat(ticket_data['created_at'].replace('Z', '+00:00'))
+            if ticket_data is None or not ticket_data.created_at:
+                ticket_data = self.freshdesk.get_ticket_by_id(ticket_id)
+            if ticket_data and ticket_data.created_at:
+                ticket_datetime = datetime.fromisoformat(ticket_data.created_at.replace('Z', '+00:00'))
                 search_date = ticket_datetime.strftime('%Y-%m-%d')
                 
-                logger.info(f"🗓️ Buscando issues do dia {search_date} para ticket #{ticket_id}")
-                
-                # Buscar todas as issues criadas no mesmo dia
-                jql = f'project = {self.jira_project_key} AND created >= "{search_date}" AND created <= "{search_date} 23:59" ORDER BY created DESC'
-                response = requests.get(
-                    f'{self.jira.base_url}/rest/api/3/search',
-                    headers=self.jira.headers,
-                    auth=self.jira.auth,
-                    params={'jql': jql, 'maxResults': 20},
-                    timeout=10
-                )
+                logger.debug("🗓️ Buscando issues do dia %s para ticket #%s", search_date, ticket_id)
                 
-                if response.status_code == 200:
-                    issues = response.json().get('issues', [])
-                    logger.info(f"📋 Encontradas {len(issues)} issues no dia {search_date}")
-                    
-                    # Filtrar issues que NÃO têm padrão [FD-X] (são issues "novas")
-                    new_issues = []
-                    for issue in issues:
-                        summary = issue['fields']['summary']
-                        if '[FD-' not in summary:
-                            new_issues.append(issue)
-                            logger.info(f"   📄 Issue sem padrão FD: {issue['key']} - {summary}")
-                    
-                    if new_issues:
-                        # Por agora, mapear para a mais recente
-                        issue = new_issues[0]
-                        logger.info(f"✅ Mapeado por data: #{ticket_id} → {issue['key']}")
+                issues = self._issues_created_on(search_date)
+                if issues is not None:
+                    # Issues sem padrão [FD-X] são issues "novas"; por agora,
+                    # mapear para a mais recente que ainda não foi atribuída
+                    issue = self._claim_unmatched(issues)
+                    if issue:
+                        logger.debug("✅ Mapeado por data: #%s → %s", ticket_id, issue['key'])
                         return issue
                     else:
-                        logger.warning(f"⚠️ Nenhuma issue nova encontrada no dia {search_date}")
+                        logger.warning("⚠️ Nenhuma issue nova disponível no dia %s", search_date)
                 else:
-                    logger.error(f"❌ Erro na busca por data: {response.status_code}")
+                    logger.error("❌ Erro na busca por data do dia %s", search_date)
         except Exception as e:
-            logger.error(f"❌ Erro na busca por data: {e}")
-        
-        # ESTRATÉGIA 3: Buscar por título genérico
+            logger.error("❌ Erro na busca por data: %s", e)
+        return None
+    
+    def _match_by_title(self, ticket_id: int, ticket_data: Optional[Ticket]) -> Optional[Dict[str, Any]]:
+        """ESTRATÉGIA 3: Buscar por título genérico"""
         try:
-            logger.info(f"🔍 Buscando por título genérico...")
+            logger.debug("🔍 Buscando por título genérico...")
             jql = f'project = {self.jira_project_key} AND summary ~ "Ticket criado" AND summary !~ "[FD-" ORDER BY created DESC'
-            response = requests.get(
-                f'{self.jira.base_url}/rest/api/3/search',
-                headers=self.jira.headers,
-                auth=self.jira.auth,
-                params={'jql': jql, 'maxResults': 10},
-                timeout=10
-            )
+            result = self.jira.search_issues(jql, max_results=10)
             
-            if response.status_code == 200:
-                issues = response.json().get('issues', [])
-                if issues:
-                    issue = issues[0]
-                    logger.info(f"✅ Encontrado por título genérico: #{ticket_id} → {issue['key']}")
+            if result is not None:
+                issue = self._claim_unmatched(result.get('issues', []))
+                if issue:
+                    logger.debug("✅ Encontrado por título genérico: #%s → %s", ticket_id, issue['key'])
                     return issue
         except Exception as e:
-            logger.error(f"❌ Erro na busca por título: {e}")
+            logger.error("❌ Erro na busca por título: %s", e)
+        return None
+    
+    def _issues_created_on(self, search_date: str) -> Optional[List[Dict[str, Any]]]:
+        """Issues do projeto criadas no dia (cache da execução, paginação completa)"""
+        with self._day_locks_guard:
+            day_lock = self._day_locks.setdefault(search_date, threading.Lock())
         
-        logger.warning(f"❌ NENHUMA issue encontrada para ticket #{ticket_id}")
+        with day_lock:
+            if search_date not in self._day_issues:
+                jql = (f'project = {self.jira_project_key} AND created >= "{search_date}" '
+                       f'AND created <= "{search_date} 23:59" ORDER BY created DESC')
+                try:
+                    self._day_issues[search_date] = list(self.jira.iter_search(jql))
+                except Exception as e:
+                    logger.error("❌ Erro na busca por data: %s", e)
+                    return None
+                logger.debug("📋 Encontradas %s issues no dia %s", len(self._day_issues[search_date]), search_date)
+            return self._day_issues[search_date]
+    
+    def _claim_unmatched(self, issues: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Primeira issue sem padrão [FD-X] ainda não atribuída a outro ticket"""
+        with self._claims_lock:
+            for issue in issues:
+                summary = issue.get('fields', {}).get('summary') or ''
+                if '[FD-' in summary or issue['key'] in self._claimed_keys:
+                    continue
+                if self.mappings is not None and self.mappings.is_mapped(issue['key']):
+                    continue
+                self._claimed_keys.add(issue['key'])
+                return issue
         return None
     
-    def _should_sync_ticket(self, ticket_data: Dict) -> tuple[bool, str]:
+    def resolve_batch(self, ticket_ids: Iterable[int]) -> int:
+        """Resolve vários tickets com poucas buscas JQL
+
+        Tickets já indexados são atualizados por lista de chaves (traz o
+        status atual e detecta issues excluídas ou movidas); os demais são
+        buscados pelo padrão [FD-X], com as tags extraídas localmente dos
+        resumos. Tickets cobertos pelo lote não repetem a busca individual.
+        """
+        ticket_ids = list(dict.fromkeys(ticket_ids))
+        
+        if self.mappings is not None:
+            indexed = {
+                ticket_id: self.mappings.get(ticket_id) for ticket_id in ticket_ids
+                if self.mappings.get(ticket_id) and ticket_id not in self._batch_matches
+            }
+            for chunk in self._chunk_terms(list(indexed), lambda t: f'{indexed[t]}, '):
+                self._refresh_indexed({ticket_id: indexed[ticket_id] for ticket_id in chunk})
+        
+        pending = [
+            ticket_id for ticket_id in ticket_ids
+            if ticket_id not in self._batch_checked
+            and (self.mappings is None or not self.mappings.get(ticket_id))
+        ]
+        if not pending:
+            return 0
+        
+        found = 0
+        for chunk in self._chunk_terms(pending, lambda t: f'summary ~ "[FD-{t}]" OR '):
+            terms = ' OR '.join(f'summary ~ "[FD-{ticket_id}]"' for ticket_id in chunk)
+            jql = f'project = {self.jira_project_key} AND ({terms}) ORDER BY created DESC'
+            
+            try:
+                issues = list(self.jira.iter_search(jql))
+            except Exception as e:
+                logger.error("❌ Erro na resolução em lote: %s", e)
+                continue
+            
+            wanted = set(chunk)
+            for issue in issues:
+                summary = issue.get('fields', {}).get('summary') or ''
+                for tag in FD_TAG_PATTERN.findall(summary):
+                    ticket_id = int(tag)
+                    if ticket_id in wanted and ticket_id not in self._batch_matches:
+                        self._batch_matches[ticket_id] = issue
+                        found += 1
+                        if self.mappings is not None:
+                            self.mappings.put(ticket_id, issue['key'], STRATEGY_TAG)
+            
+            self._batch_checked.update(chunk)
+        
+        logger.info("📦 Resolução em lote: %s/%s tickets com padrão [FD-X]", found, len(pending))
+        return found
+    
+    def _refresh_indexed(self, entries: Dict[int, str]):
+        """Busca as issues indexadas por chave; invalida as que sumiram"""
+        jql = f'key in ({", ".join(entries.values())})'
+        
+        try:
+            issues = list(self.jira.iter_search(jql))
+        except JiraSearchError as e:
+            # O Jira rejeita a busca inteira se uma das chaves não existe mais:
+            # divide o grupo até isolar a chave inválida
+            if e.status_code != 400:
+                logger.error("❌ Erro ao atualizar issues indexadas: %s", e)
+                return
+            if len(entries) > 1:
+                items = list(entries.items())
+                middle = len(items) // 2
+                self._refresh_indexed(dict(items[:middle]))
+                self._refresh_indexed(dict(items[middle:]))
+                return
+            issues = []
+        
+        by_key = {issue['key']: issue for issue in issues}
+        for ticket_id, issue_key in entries.items():
+            issue = by_key.get(issue_key)
+            if issue:
+                self._batch_matches[ticket_id] = issue
+            else:
+                logger.warning("♻️ Mapeamento #%s → %s desatualizado (issue excluída ou movida)", ticket_id, issue_key)
+                self.mappings.invalidate(ticket_id)
+    
+    def _chunk_terms(self, ticket_ids: List[int], term) -> Iterable[List[int]]:
+        """Divide os tickets em grupos cujos termos cabem numa busca JQL"""
+        chunk, size = [], 0
+        for ticket_id in ticket_ids:
+            term_size = len(term(ticket_id))
+            if chunk and size + term_size > BATCH_JQL_MAX_CHARS:
+                yield chunk
+                chunk, size = [], 0
+            chunk.append(ticket_id)
+            size += term_size
+        if chunk:
+            yield chunk
+    
+    def preflight_transitions(self) -> List[str]:
+        """Avisa sobre transições configuradas que nenhum workflow oferece
+
+        Amostra as issues recentes do projeto, uma por (tipo, status), e
+        consulta as transições via cache. Retorna os ids não encontrados.
+        """
+        configured = set(self.config.transitions.values())
+        jql = f'project = {self.jira_project_key} ORDER BY updated DESC'
+        
+        result = self.jira.search_issues(jql, max_results=PREFLIGHT_SAMPLE_SIZE)
+        if result is None:
+            logger.warning("⚠️ Preflight de transições: busca de amostra falhou")
+            return []
+        
+        offered = self.transitions.offered_ids(result.get('issues', []))
+        if not offered:
+            return []
+        
+        missing = sorted(configured - offered)
+        for transition_id in missing:
+            logger.warning(f"⚠️ Transição '{transition_id}' configurada, mas nenhum workflow amostrado a oferece")
+        if not missing:
+            logger.info(f"✅ Preflight: {len(configured)} transições configuradas existem no workflow")
+        return missing
+    
+    def _should_sync_ticket(self, ticket_data: Ticket) -> tuple[bool, str]:
         """Verifica se deve sincronizar"""
-        freshdesk_status = ticket_data['status']
-        transitions = self.config.get('FRESHDESK_TO_JIRA_TRANSITIONS', {})
+        freshdesk_status = ticket_data.status
         
-        if freshdesk_status not in transitions:
+        if freshdesk_status not in self.config.transitions:
             return False, f"Status {freshdesk_status} não configurado"
         
+        if self.ledger is not None and self.ledger.is_unchanged(ticket_data.id, freshdesk_status):
+            return False, f"Status {freshdesk_status} inalterado desde o último envio"
+        
         return True, "OK para sincronizar"
     
-    def _get_available_transitions(self, issue_key: str) -> Dict[str, str]:
-        """Obtém transições disponíveis"""
-        try:
-            response = requests.get(
-                f'{self.jira.base_url}/rest/api/3/issue/{issue_key}/transitions',
-                headers=self.jira.headers,
-                auth=self.jira.auth,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                transitions_data = response.json().get('transitions', [])
-                return {t['id']: t['name'] for t in transitions_data}
-            return {}
-        except Exception as e:
-            logger.error(f"❌ Erro ao obter transições: {e}")
-            return {}
-    
-    def sync_single_ticket(self, ticket_data: Dict) -> bool:
+    def sync_single_ticket(self, ticket_data: Ticket) -> bool:
         """Sincroniza um ticket"""
-        ticket_id = ticket_data['id']
-        freshdesk_status = ticket_data['status']
+        return self.sync_ticket(ticket_data) != RESULT_FAILED
+    
+    def sync_ticket(self, ticket_data: Ticket) -> str:
+        """Sincroniza um ticket e retorna RESULT_SUCCESS, RESULT_FAILED ou RESULT_SKIPPED"""
+        started = time.perf_counter()
+        ticket_id = ticket_data.id
+        freshdesk_status = ticket_data.status
         
-        logger.info(f"🎫 Processando ticket #{ticket_id}")
-        logger.info(f"📊 Status Freshdesk: {freshdesk_status}")
+        logger.debug("🎫 Processando ticket #%s (status Freshdesk %s)", ticket_id, freshdesk_status)
         
         should_sync, reason = self._should_sync_ticket(ticket_data)
         if not should_sync:
-            logger.info(f"⏭️ PULANDO: {reason}")
-            return True
+            logger.debug("⏭️ PULANDO #%s: %s", ticket_id, reason,
+                         extra=self._log_fields(ticket_id, RESULT_SKIPPED, started))
+            return RESULT_SKIPPED
         
-        jira_issue = self.find_corresponding_jira_issue(ticket_id)
+        jira_issue, strategy = self.resolve_jira_issue(ticket_id, ticket_data=ticket_data)
         if not jira_issue:
-            logger.error(f"❌ Issue não encontrada para #{ticket_id}")
-            return False
+            logger.error("❌ Issue não encontrada para #%s", ticket_id,
+                         extra=self._log_fields(ticket_id, RESULT_FAILED, started))
+            return RESULT_FAILED
         
         issue_key = jira_issue['key']
-        transitions = self.config.get('FRESHDESK_TO_JIRA_TRANSITIONS', {})
-        target_transition = transitions[freshdesk_status]
+        target_transition = self.config.transitions[freshdesk_status]
         
-        logger.info(f"🎯 Transição: {target_transition} para {issue_key}")
+        logger.debug("🎯 Transição: %s para %s", target_transition, issue_key)
+        
+        verdict, reason = self.transitions.check(jira_issue, target_transition)
+        if verdict in (CHECK_NOOP, CHECK_UNAVAILABLE):
+            logger.info("⏭️ PULANDO #%s → %s: %s", ticket_id, issue_key, reason,
+                        extra=self._log_fields(ticket_id, RESULT_SKIPPED, started, issue_key, strategy))
+            if verdict == CHECK_NOOP and self.ledger is not None and not self.dry_run:
+                self.ledger.record(ticket_id, freshdesk_status, ticket_data.updated_at,
+                                   issue_key, target_transition)
+            return RESULT_SKIPPED
         
         if self.dry_run:
-            logger.info(f"🧪 [DRY RUN] Simularia transição '{target_transition}'")
-            return True
-        else:
+            logger.info("🧪 [DRY RUN] #%s → %s: simularia transição '%s'", ticket_id, issue_key, target_transition,
+                        extra=self._log_fields(ticket_id, RESULT_SUCCESS, started, issue_key, strategy))
+            return RESULT_SUCCESS
+        
+        if self._pending is not None and 'id' in jira_issue:
+            with self._pending_lock:
+                self._pending.append(PendingTransition(ticket_data, jira_issue, strategy, target_transition, started))
+            logger.debug("📦 #%s → %s: transição '%s' adiada para o lote", ticket_id, issue_key, target_transition)
+            return RESULT_PENDING
+        
+        return self._execute_transition(ticket_data, jira_issue, strategy, target_transition, started)
+    
+    def _execute_transition(self, ticket_data: Ticket, jira_issue: Dict[str, Any], strategy: str,
+                            target_transition: str, started: float, transitioned: bool = False) -> str:
+        """Aplica a transição (salvo se o lote já aplicou) e registra o resultado do ticket"""
+        ticket_id = ticket_data.id
+        freshdesk_status = ticket_data.status
+        issue_key = jira_issue['key']
+        
+        success = transitioned or self.jira.transition_issue(issue_key, target_transition)
+        
+        if not success and strategy == STRATEGY_INDEX and self._invalidate_stale_mapping(ticket_id, issue_key):
+            jira_issue, strategy = self.resolve_jira_issue(ticket_id, use_index=False, ticket_data=ticket_data)
+            if not jira_issue:
+                logger.error("❌ Issue não encontrada para #%s", ticket_id,
+                             extra=self._log_fields(ticket_id, RESULT_FAILED, started))
+                return RESULT_FAILED
+            issue_key = jira_issue['key']
+            logger.debug("🎯 Transição: %s para %s", target_transition, issue_key)
             success = self.jira.transition_issue(issue_key, target_transition)
-            if success:
-                logger.info(f"✅ SUCESSO! {issue_key} sincronizada")
-            else:
-                logger.error(f"❌ FALHA na transição de {issue_key}")
-            return success
+        
+        if not success:
+            logger.error("❌ FALHA na transição de %s (#%s)", issue_key, ticket_id,
+                         extra=self._log_fields(ticket_id, RESULT_FAILED, started, issue_key, strategy))
+            return RESULT_FAILED
+        
+        if self.mappings is not None and strategy in (STRATEGY_DATE, STRATEGY_TITLE):
+            self.mappings.put(ticket_id, issue_key, strategy)
+        if self.ledger is not None:
+            self.ledger.record(ticket_id, freshdesk_status, ticket_data.updated_at,
+                               issue_key, target_transition)
+        logger.info("✅ SUCESSO! #%s → %s sincronizada (%s)", ticket_id, issue_key, strategy,
+                    extra=self._log_fields(ticket_id, RESULT_SUCCESS, started, issue_key, strategy))
+        return RESULT_SUCCESS
     
-    def sync_all_tickets(self, hours_back: int = 24) -> Dict[str, int]:
-        """Sincroniza todos os tickets"""
-        logger.info(f"🚀 Sincronização - últimas {hours_back}h")
+    def _log_fields(self, ticket_id: int, result: str, started: float, issue_key: Optional[str] = None,
+                    strategy: Optional[str] = None) -> Dict[str, Any]:
+        """Campos estruturados da linha de resultado de um ticket (logs JSON)"""
+        return {
+            'client': self.config.name,
+            'ticket_id': ticket_id,
+            'issue_key': issue_key,
+            'strategy': strategy,
+            'result': result,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+        }
+    
+    def _invalidate_stale_mapping(self, ticket_id: int, issue_key: str) -> bool:
+        """Invalida o índice se a issue foi excluída ou movida de projeto"""
+        issue = self.jira.get_issue(issue_key)
+        if issue and issue.get('key') == issue_key:
+            return False
         
-        try:
-            tickets = self.freshdesk.get_tickets(updated_since_hours=hours_back)
-        except Exception as e:
-            logger.error(f"❌ Erro ao buscar tickets: {e}")
-            return {"success": 0, "failed": 0, "skipped": 0}
+        logger.warning("♻️ Mapeamento #%s → %s desatualizado (issue excluída ou movida)", ticket_id, issue_key)
+        self.mappings.invalidate(ticket_id)
+        return True
+    
+    def reset_run_state(self):
+        """Descarta os caches da execução (lote, issues por dia, atribuições)"""
+        self._batch_checked.clear()
+        self._batch_matches.clear()
+        self._retried.clear()
+        self._day_issues.clear()
+        if not self._shared_claims:
+            self._claimed_keys.clear()
+    
+    def sync_incremental(self, default_hours: int = 24) -> Dict[str, int]:
+        """Sincroniza só o que mudou desde a última execução bem-sucedida
+
+        A marca d'água só avança quando a busca termina sem erro e nenhum
+        ticket falha (ou as falhas ficaram na fila de retry); a próxima
+        janela começa nela menos uma sobreposição.
+        """
+        if self.watermark is None:
+            raise ValueError("Sincronização incremental requer marca d'água configurada")
+        
+        window = incremental_window(self.watermark.get(), default_hours)
+        logger.info(f"🕒 Janela incremental: {window}")
         
-        if not tickets:
+        stats = self.sync_all_tickets(updated_since=window.start)
+        
+        if self._fetch_complete and (stats["failed"] == 0 or self.retries is not None):
+            if not self.dry_run:
+                self.watermark.advance(window.end)
+                logger.info(f"💾 Marca d'água avançada para {window.end.isoformat()}")
+        else:
+            logger.warning("⚠️ Execução incompleta: marca d'água mantida")
+        return stats
+    
+    def sync_all_tickets(self, hours_back: int = 24, updated_since: Optional[datetime] = None) -> Dict[str, int]:
+        """Sincroniza todos os tickets, página a página"""
+        if updated_since is None:
+            updated_since = utc_now() - timedelta(hours=hours_back)
+            logger.info(f"🚀 Sincronização - últimas {hours_back}h")
+        else:
+            logger.info(f"🚀 Sincronização - desde {updated_since.isoformat()}")
+        
+        self.check_connections()
+        
+        stats = {"success": 0, "failed": 0, "skipped": 0}
+        self.reset_run_state()
+        
+        traffic_before = (self.freshdesk.traffic_stats(), self.jira.traffic_stats())
+        
+        self.ensure_preflight()
+        
+        with self.metrics.phase('retries'):
+            self.drain_retries(stats)
+        
+        processed = self._sync_pages(self._iter_relevant_pages(updated_since), stats)
+        
+        if not processed:
             logger.info("⚠️ Nenhum ticket encontrado")
-            return {"success": 0, "failed": 0, "skipped": 0}
         
-        logger.info(f"📋 Processando {len(tickets)} tickets")
+        connections = self.jira.connection_stats()
+        logger.info(f"🔌 Conexões Jira: {connections['requests']} requisições, "
+                    f"{connections['opened']} abertas, {connections['reused']} reutilizadas")
         
+        for name, client, before in (("Freshdesk", self.freshdesk, traffic_before[0]),
+                                     ("Jira", self.jira, traffic_before[1])):
+            after = client.traffic_stats()
+            logger.info(f"📦 Payload {name}: {after['calls'] - before['calls']} chamadas, "
+                        f"{(after['bytes'] - before['bytes']) / 1024:.1f} KB")
+        
+        phases = ', '.join(
+            f"{phase} {self.metrics.counter(PHASE_SECONDS, phase=phase):.1f}s"
+            for phase in ('fetch', 'resolve_batch', 'tickets', 'transitions')
+        )
+        logger.info(f"⏱️ Tempo acumulado: {phases}, rate limit {self.metrics.counter(RATE_LIMIT_SLEEP):.1f}s")
+        logger.info(f"\n🏁 Concluído! {stats}")
+        return stats
+    
+    def ensure_preflight(self):
+        """Preflight das transições configuradas, uma vez por serviço"""
+        if not self._preflight_done:
+            self._preflight_done = True
+            with self.metrics.phase('preflight'):
+                self.preflight_transitions()
+    
+    def sync_window(self, window: TimeWindow) -> Dict[str, int]:
+        """Sincroniza os tickets atualizados dentro da janela [início, fim)
+
+        Usado pelo backfill: não testa conexões, não faz preflight nem
+        drena a fila de retry (o chamador cuida disso uma vez). Consulte
+        `fetch_complete` para saber se a janela foi percorrida inteira.
+        """
         stats = {"success": 0, "failed": 0, "skipped": 0}
-        delay = self.config.get('RATE_LIMIT_DELAY', 1.0)
+        self.reset_run_state()
+        self._sync_pages(self._iter_relevant_pages(window.start, window.end), stats)
+        return stats
+    
+    @property
+    def fetch_complete(self) -> bool:
+        """Se a última execução percorreu todas as páginas sem erro de busca"""
+        return self._fetch_complete
+    
+    def spawn(self) -> 'SyncService':
+        """Serviço irmão para rodar outra janela em paralelo
+
+        Compartilha clientes HTTP (e seus limites de taxa), configuração,
+        índice, ledger, fila de retry, métricas, cache de transições e as
+        issues já atribuídas pelas heurísticas; o estado da execução é próprio.
+        """
+        sibling = SyncService(
+            self.freshdesk, self.jira, self.config,
+            mappings=self.mappings,
+            workers=self.workers,
+            ledger=self.ledger,
+            retries=self.retries,
+            metrics=self.metrics
+        )
+        sibling.dry_run = self.dry_run
+        sibling.skip_health_check = self.skip_health_check
+        sibling.transitions = self.transitions
+        sibling._preflight_done = True
+        
+        self._shared_claims = sibling._shared_claims = True
+        sibling._claimed_keys = self._claimed_keys
+        sibling._claims_lock = self._claims_lock
+        return sibling
+    
+    def _sync_pages(self, pages: Iterable[List[Ticket]], stats: Dict[str, int]) -> int:
+        """Processa as páginas (lote de resolução, tickets e transições); retorna os tickets vistos"""
+        self._fetch_complete = False
+        
+        # Transições das páginas vão em lote por id de transição (API de lote do Jira Cloud)
+        if self.config.jira_bulk_transitions and not self.dry_run and self.jira.bulk_supported:
+            self._pending = []
+        
+        # A próxima página é baixada enquanto a atual é processada;
+        # a fase "fetch" mede só a espera por páginas ainda não prontas
+        pages = self._timed_pages(prefetch(pages))
+        processed = 0
+        
+        executor = None
+        if self.workers > 1:
+            logger.info(f"⚡ Modo concorrente: {self.workers} workers")
+            executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="sync")
+        
+        try:
+            for page_number, tickets in enumerate(pages, 1):
+                logger.info("📋 Página %s: %s tickets", page_number, len(tickets))
+                tickets = [t for t in tickets if t.id not in self._retried]
+                with self.metrics.phase('resolve_batch'):
+                    self.resolve_batch(t.id for t in tickets if self._should_sync_ticket(t)[0])
+                
+                with self.metrics.phase('tickets'):
+                    if executor is not None:
+                        futures = []
+                        for ticket in tickets:
+                            processed += 1
+                            futures.append(executor.submit(self._process_ticket_grouped, processed, ticket, stats))
+                        wait(futures)
+                    else:
+                        for ticket in tickets:
+                            processed += 1
+                            self._process_ticket(processed, ticket, stats)
+                
+                with self.metrics.phase('transitions'):
+                    self.flush_transitions(stats, executor)
+            
+            self._fetch_complete = True
+        except Exception as e:
+            logger.error("❌ Erro ao buscar tickets: %s", e)
+        finally:
+            if self._pending:
+                self.flush_transitions(stats, executor)
+            self._pending = None
+            if executor is not None:
+                executor.shutdown(wait=True)
+        return processed
+    
+    def _timed_pages(self, pages: Iterable[List[Ticket]]) -> Iterable[List[Ticket]]:
+        """Repassa as páginas contando o tempo de espera na fase 'fetch'"""
+        iterator = iter(pages)
+        while True:
+            with self.metrics.phase('fetch'):
+                page = next(iterator, None)
+            if page is None:
+                return
+            yield page
+    
+    def drain_retries(self, stats: Dict[str, int]) -> int:
+        """Reprocessa os tickets da fila de retry cuja tentativa já venceu"""
+        if self.retries is None:
+            return 0
+        
+        due = self.retries.due()
+        if not due:
+            return 0
         
-        for i, ticket in enumerate(tickets, 1):
-            logger.info(f"\n[{i}/{len(tickets)}] Ticket #{ticket['id']}")
+        logger.info("🔁 Fila de retry: %s tickets com nova tentativa vencida", len(due))
+        for position, ticket_id in enumerate(due, 1):
+            self._retried.add(ticket_id)
+            ticket = self.freshdesk.get_ticket_by_id(ticket_id)
+            if ticket is None:
+                logger.error("❌ Ticket #%s não encontrado no Freshdesk", ticket_id)
+                self.track_result(ticket_id, RESULT_FAILED, "ticket não encontrado no Freshdesk")
+                with self._stats_lock:
+                    stats[RESULT_FAILED] += 1
+                continue
+            self._process_ticket(position, ticket, stats)
+        return len(due)
+    
+    def track_result(self, ticket_id: int, result: str, error: Optional[str] = None):
+        """Atualiza a fila de retry com o resultado de um ticket"""
+        if self.retries is None or self.dry_run:
+            return
+        
+        if result != RESULT_FAILED:
+            self.retries.resolve(ticket_id)
+            return
+        
+        entry = self.retries.record_failure(ticket_id, error or "falha na sincronização")
+        if entry.state == RETRY_DEAD:
+            logger.error("💀 Ticket #%s: %s falhas, movido para dead-letter", ticket_id, entry.attempts)
+        else:
+            logger.warning("🔁 Ticket #%s: nova tentativa agendada para %s", ticket_id, entry.next_attempt_at)
+    
+    def _iter_relevant_pages(self, updated_since: datetime, updated_before: Optional[datetime] = None):
+        """Páginas de tickets; com filtro no servidor pelos status configurados"""
+        if self.config.freshdesk_server_filter:
+            statuses = self.config.transitions.keys()
+            return self.freshdesk.iter_filtered_ticket_pages(statuses, updated_since=updated_since,
+                                                             updated_before=updated_before)
+        return self.freshdesk.iter_ticket_pages(updated_since=updated_since, updated_before=updated_before)
+    
+    def _process_ticket(self, position: int, ticket: Ticket, stats: Dict[str, int]):
+        """Sincroniza um ticket e contabiliza o resultado"""
+        logger.debug("\n[%s] Ticket #%s", position, ticket.id)
+        
+        error = None
+        started = time.perf_counter()
+        try:
+            result = self.sync_ticket(ticket)
+        except Exception as e:
+            logger.error("❌ Erro no ticket #%s: %s", ticket.id, e)
+            result, error = RESULT_FAILED, str(e)
+        
+        if result == RESULT_PENDING:
+            return
+        self._record_result(ticket.id, result, started, error, stats)
+    
+    def _record_result(self, ticket_id: int, result: str, started: float, error: Optional[str],
+                       stats: Dict[str, int]):
+        """Métricas, fila de retry e contadores da execução para um ticket concluído"""
+        self.metrics.observe(TICKET_SECONDS, time.perf_counter() - started, result=result)
+        self.metrics.inc(TICKETS, result=result)
+        self.track_result(ticket_id, result, error)
+        with self._stats_lock:
+            stats[result] += 1
+    
+    def flush_transitions(self, stats: Dict[str, int], executor: Optional[ThreadPoolExecutor] = None) -> int:
+        """Envia as transições adiadas, agrupadas por id de transição, e conclui os tickets
+
+        Grupos com menos de BULK_MIN_ISSUES issues, issues que falharam no
+        lote e lotes recusados seguem por chamadas individuais. Issues de um
+        lote que não terminou no prazo nunca são reenviadas: a issue é relida
+        e, se ainda não chegou ao destino, o ticket fica para nova tentativa.
+        """
+        with self._pending_lock:
+            pending = list(self._pending or ())
+            if self._pending:
+                self._pending.clear()
+        return self.apply_transitions(pending, stats, executor)
+    
+    def apply_transitions(self, pending: List[PendingTransition], stats: Dict[str, int],
+                          executor: Optional[ThreadPoolExecutor] = None) -> int:
+        """Aplica as transições informadas (em lote quando possível) e conclui os tickets"""
+        if not pending:
+            return 0
+        
+        groups: Dict[str, List[PendingTransition]] = {}
+        for item in pending:
+            groups.setdefault(item.transition_id, []).append(item)
+        
+        bulk = [item for items in groups.values() if len(items) >= BULK_MIN_ISSUES for item in items]
+        applied: Dict[str, Optional[bool]] = {}
+        if bulk and self.config.jira_bulk_transitions and self.jira.bulk_supported:
+            for start in range(0, len(bulk), BULK_MAX_ISSUES):
+                chunk: Dict[str, List[Dict[str, Any]]] = {}
+                for item in bulk[start:start + BULK_MAX_ISSUES]:
+                    chunk.setdefault(item.transition_id, []).append(item.issue)
+                results = self.jira.bulk_transition(chunk)
+                if results is None:
+                    logger.warning("⚠️ Transição em lote recusada: usando chamadas individuais")
+                    break
+                applied.update(results)
             
+            logger.info("📦 Lote: %d de %d transições aplicadas em %d grupos", sum(1 for ok in applied.values() if ok),
+                        len(bulk), len({item.transition_id for item in bulk}))
+        
+        def finish(item: PendingTransition):
+            error = None
             try:
-                success = self.sync_single_ticket(ticket)
-                if success:
-                    stats["success"] += 1
+                transitioned = applied.get(item.issue['key'], False)
+                if transitioned is None:
+                    transitioned = self._confirm_bulk_transition(item)
+                if transitioned is None:
+                    # Sem chamada individual: o lote ainda pode aplicar a transição
+                    logger.warning("⏳ #%s → %s: lote não concluído no prazo; fica para a próxima tentativa",
+                                   item.ticket.id, item.issue['key'],
+                                   extra=self._log_fields(item.ticket.id, RESULT_FAILED, item.started,
+                                                          item.issue['key'], item.strategy))
+                    result, error = RESULT_FAILED, "transição em lote não concluída"
                 else:
-                    stats["failed"] += 1
+                    result = self._execute_transition(item.ticket, item.issue, item.strategy, item.transition_id,
+                                                      item.started, transitioned=transitioned)
             except Exception as e:
-                logger.error(f"❌ Erro: {e}")
-                stats["failed"] += 1
+                logger.error("❌ Erro no ticket #%s: %s", item.ticket.id, e)
+                result, error = RESULT_FAILED, str(e)
+            self._record_result(item.ticket.id, result, item.started, error, stats)
+        
+        if executor is not None:
+            wait([executor.submit(finish, item) for item in pending])
+        else:
+            for item in pending:
+                finish(item)
+        return len(pending)
+    
+    def _confirm_bulk_transition(self, item: PendingTransition) -> Optional[bool]:
+        """Relê a issue de um lote sem resultado final: True se já está no destino, None se ainda não dá para saber"""
+        target = ((self.transitions.get(item.issue) or {}).get(item.transition_id) or {}).get('to')
+        issue = self.jira.get_issue(item.issue['key'])
+        status = ((issue or {}).get('fields') or {}).get('status') or {}
+        if target and status.get('id') == target:
+            return True
+        return None
+    
+    def reconcile(self, updated_since: Optional[datetime] = None) -> Dict[str, int]:
+        """Compara o status atual de todos os tickets relevantes com o das issues e transiciona só as divergentes
+
+        Duas listagens paginadas - tickets do Freshdesk nos status
+        configurados e issues do projeto no Jira, só com os campos usados -
+        unidas em memória pelo índice de mapeamentos e pelo padrão [FD-X].
+        Ao contrário da sincronização, ignora o ledger: detecta também
+        issues movidas à mão no Jira. Tickets sem issue conhecida ficam
+        para a sincronização normal, que tem as heurísticas de data e título.
+        """
+        since = updated_since or RECONCILE_SINCE
+        logger.info(f"⚖️ Reconciliação - tickets atualizados desde {since.date().isoformat()}")
+        
+        self.check_connections()
+        self.reset_run_state()
+        self.ensure_preflight()
+        
+        report = {"tickets": 0, "issues": 0, "in_sync": 0, "drift": 0, "blocked": 0, "unmapped": 0,
+                  "success": 0, "failed": 0}
+        
+        with self.metrics.phase('fetch'):
+            tickets = {
+                ticket.id: ticket
+                for page in self._iter_relevant_pages(since) for ticket in page
+                if ticket.status in self.config.transitions
+            }
+        report["tickets"] = len(tickets)
+        
+        # Issue de cada ticket: o índice vale mais que o padrão [FD-X]
+        indexed: Dict[str, int] = {}
+        if self.mappings is not None:
+            for ticket_id in tickets:
+                issue_key = self.mappings.get(ticket_id)
+                if issue_key:
+                    indexed[issue_key] = ticket_id
+        
+        indexed_tickets = set(indexed.values())
+        matches: Dict[int, Tuple[Dict[str, Any], str]] = {}
+        with self.metrics.phase('fetch'):
+            jql = f'project = {self.jira_project_key} ORDER BY created ASC'
+            for issue in self.jira.iter_search(jql):
+                report["issues"] += 1
+                ticket_id = indexed.get(issue['key'])
+                if ticket_id is not None:
+                    matches[ticket_id] = (issue, STRATEGY_INDEX)
+                    continue
+                summary = (issue.get('fields') or {}).get('summary') or ''
+                for tag in FD_TAG_PATTERN.findall(summary):
+                    tag_id = int(tag)
+                    if tag_id in tickets and tag_id not in matches and tag_id not in indexed_tickets:
+                        matches[tag_id] = (issue, STRATEGY_TAG)
+        
+        drift: List[PendingTransition] = []
+        for ticket_id, ticket in tickets.items():
+            if ticket_id not in matches:
+                report["unmapped"] += 1
+                continue
+            
+            issue, strategy = matches[ticket_id]
+            if strategy == STRATEGY_TAG and self.mappings is not None:
+                self.mappings.put(ticket_id, issue['key'], strategy)
             
-            if i < len(tickets):
-                time.sleep(delay)
+            transition_id = self.config.transitions[ticket.status]
+            verdict, reason = self.transitions.check(issue, transition_id)
+            if verdict == CHECK_NOOP:
+                report["in_sync"] += 1
+                if (self.ledger is not None and not self.dry_run
+                        and not self.ledger.is_unchanged(ticket_id, ticket.status)):
+                    self.ledger.record(ticket_id, ticket.status, ticket.updated_at, issue['key'], transition_id)
+            elif verdict == CHECK_UNAVAILABLE:
+                report["blocked"] += 1
+                logger.info("⛔ #%s → %s: %s", ticket_id, issue['key'], reason)
+            else:
+                drift.append(PendingTransition(ticket, issue, strategy, transition_id, time.perf_counter()))
         
-        logger.info(f"\n🏁 Concluído! {stats}")
-        return stats
+        report["drift"] = len(drift)
+        logger.info("🔍 %d tickets, %d issues: %d em dia, %d divergentes, %d bloqueados, %d sem issue",
+                    report["tickets"], report["issues"], report["in_sync"], report["drift"],
+                    report["blocked"], report["unmapped"])
+        
+        stats = {"success": 0, "failed": 0, "skipped": 0}
+        if self.dry_run:
+            for item in drift:
+                logger.info("🧪 [DRY RUN] #%s → %s: simularia transição '%s'",
+                            item.ticket.id, item.issue['key'], item.transition_id)
+                self._record_result(item.ticket.id, RESULT_SUCCESS, item.started, None, stats)
+        else:
+            executor = None
+            if self.workers > 1 and drift:
+                executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="reconcile")
+            try:
+                with self.metrics.phase('transitions'):
+                    self.apply_transitions(drift, stats, executor)
+            finally:
+                if executor is not None:
+                    executor.shutdown(wait=True)
+        
+        report["success"], report["failed"] = stats["success"], stats["failed"]
+        logger.info(f"\n🏁 Reconciliação concluída! {report}")
+        return report
+    
+    def _process_ticket_grouped(self, position: int, ticket: Ticket, stats: Dict[str, int]):
+        """Versão para workers: logs do ticket emitidos em bloco"""
+        with grouped_logs(logger):
+            self._process_ticket(position, ticket, stats)
     
     def test_mapping(self, ticket_ids: list = None) -> Dict[str, Any]:
         """Testa mapeamento"""
         if ticket_ids is None:
             try:
-                tickets = self.freshdesk.get_tickets(updated_since_hours=48)
-                ticket_ids = [t['id'] for t in tickets[:5]]
+                first_page = next(self.freshdesk.iter_ticket_pages(updated_since_hours=48), [])
+                ticket_ids = [t.id for t in first_page[:5]]
             except:
                 return {}
         
@@ -274,7 +978,7 @@ class SyncService:
                 results[ticket_id] = {
                     'success': True,
                     'jira_key': jira_issue['key'],
-                    'jira_summary': jira_issue['fields']['summary']
+                    'jira_summary': jira_issue.get('fields', {}).get('summary', '')
                 }
             else:
                 results[ticket_id] = {'success': False, 'error': 'Não encontrada'}
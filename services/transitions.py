@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Cache das transições disponíveis por (projeto, tipo de issue, status)
+"""
+import threading
+import time
+from typing import Dict, Optional, Tuple, Any, Iterable, Set
+
+from providers.jira import JiraClient
+from utils.logger import get_logger
+
+logger = get_logger()
+
+DEFAULT_TTL = 900  # segundos
+
+# Resultado da validação local de uma transição
+CHECK_OK = 'ok'
+CHECK_NOOP = 'noop'
+CHECK_UNAVAILABLE = 'unavailable'
+CHECK_UNKNOWN = 'unknown'
+
+WorkflowKey = Tuple[str, str, str]
+
+
+def workflow_key(issue: Dict[str, Any]) -> Optional[WorkflowKey]:
+    """(projeto, tipo, status) da issue, ou None se os campos não vieram na resposta"""
+    fields = issue.get('fields') or {}
+    project = (fields.get('project') or {}).get('key')
+    issue_type = (fields.get('issuetype') or {}).get('id')
+    status = (fields.get('status') or {}).get('id')
+    if not (project and issue_type and status):
+        return None
+    return project, issue_type, status
+
+
+class TransitionCache:
+    """Transições disponíveis, preenchidas sob demanda e compartilhadas entre tickets
+
+    Issues com o mesmo projeto, tipo e status oferecem as mesmas transições,
+    então uma única chamada a /transitions serve todos os tickets desse grupo.
+    """
+
+    def __init__(self, jira: JiraClient, ttl: float = DEFAULT_TTL):
+        self.jira = jira
+        self.ttl = ttl
+        self._entries: Dict[WorkflowKey, Tuple[float, Dict[str, Dict[str, str]]]] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[WorkflowKey, threading.Lock] = {}
+        # Status de destino de cada transição por workflow (projeto, tipo),
+        # aprendido das respostas: o Jira reaproveita ids entre workflows
+        self.targets: Dict[Tuple[str, str], Dict[str, str]] = {}
+
+    def _lock_for(self, key: WorkflowKey) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, issue: Dict[str, Any]) -> Optional[Dict[str, Dict[str, str]]]:
+        """Transições {id: {name, to}} oferecidas à issue, ou None se desconhecidas"""
+        key = workflow_key(issue)
+        if key is None:
+            return None
+
+        with self._lock_for(key):
+            cached = self._entries.get(key)
+            if cached and time.monotonic() - cached[0] < self.ttl:
+                return cached[1]
+
+            transitions = self.jira.get_transitions(issue['key'])
+            if transitions is None:
+                return None
+
+            available = {
+                t['id']: {'name': t.get('name', ''), 'to': (t.get('to') or {}).get('id', '')}
+                for t in transitions
+            }
+            self._entries[key] = (time.monotonic(), available)
+
+        learned = {transition_id: info['to'] for transition_id, info in available.items() if info['to']}
+        if learned:
+            with self._lock:
+                self.targets.setdefault(key[:2], {}).update(learned)
+        return available
+
+    def check(self, issue: Dict[str, Any], transition_id: str) -> Tuple[str, str]:
+        """Valida a transição localmente, retornando (CHECK_*, motivo)
+
+        CHECK_UNKNOWN significa que faltam dados para decidir; nesse caso a
+        transição é enviada como antes.
+        """
+        key = workflow_key(issue)
+        if key is None:
+            return CHECK_UNKNOWN, "status atual desconhecido"
+
+        current_status = key[2]
+        if self.targets.get(key[:2], {}).get(transition_id) == current_status:
+            return CHECK_NOOP, f"issue já está no status de destino da transição {transition_id}"
+
+        available = self.get(issue)
+        if available is None:
+            return CHECK_UNKNOWN, "transições indisponíveis"
+
+        if transition_id not in available:
+            status_name = ((issue.get('fields') or {}).get('status') or {}).get('name', current_status)
+            return CHECK_UNAVAILABLE, f"transição {transition_id} não disponível no status '{status_name}'"
+
+        if available[transition_id]['to'] == current_status:
+            return CHECK_NOOP, f"issue já está no status de destino da transição {transition_id}"
+
+        return CHECK_OK, "transição disponível"
+
+    def offered_ids(self, issues: Iterable[Dict[str, Any]]) -> Set[str]:
+        """União das transições oferecidas aos grupos das issues informadas"""
+        offered: Set[str] = set()
+        seen: Set[WorkflowKey] = set()
+        for issue in issues:
+            key = workflow_key(issue)
+            if key is None or key in seen:
+                continue
+            seen.add(key)
+            offered.update(self.get(issue) or {})
+        return offered
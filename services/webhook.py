@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Servidor de webhooks: sincronização em tempo real a partir das automações do Freshdesk
+"""
+import hmac
+import json
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from services.sync import SyncService, RESULT_FAILED
+from utils.logger import get_logger, grouped_logs
+
+logger = get_logger()
+
+DEFAULT_DEBOUNCE = 2.0  # segundos de espera para agrupar rajadas do mesmo ticket
+MAX_BODY_BYTES = 64 * 1024
+
+
+class CoalescingQueue:
+    """Fila em memória que mantém só o evento mais recente de cada ticket
+
+    Um ticket fica pendente por `debounce` segundos a partir do primeiro
+    evento; eventos repetidos nesse intervalo são fundidos num só.
+    """
+
+    def __init__(self, debounce: float = DEFAULT_DEBOUNCE):
+        self.debounce = debounce
+        self._pending: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._in_progress = set()
+        self._cond = threading.Condition()
+        self.received = 0
+        self.merged = 0
+
+    def put(self, ticket_id: int, payload: Dict[str, Any]):
+        with self._cond:
+            self.received += 1
+            if ticket_id in self._pending:
+                first_seen, _ = self._pending[ticket_id]
+                self._pending[ticket_id] = (first_seen, payload)
+                self.merged += 1
+            else:
+                self._pending[ticket_id] = (time.monotonic(), payload)
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """Próximo ticket pronto (fora da janela de debounce e não em processamento)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                wait = None
+                for ticket_id, (first_seen, payload) in self._pending.items():
+                    if ticket_id in self._in_progress:
+                        continue
+                    ready_at = first_seen + self.debounce
+                    if ready_at <= now:
+                        del self._pending[ticket_id]
+                        self._in_progress.add(ticket_id)
+                        return ticket_id, payload
+                    wait = ready_at - now if wait is None else min(wait, ready_at - now)
+                    break
+
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return None
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._cond.wait(wait)
+
+    def done(self, ticket_id: int):
+        """Libera o ticket para novos processamentos"""
+        with self._cond:
+            self._in_progress.discard(ticket_id)
+            self._cond.notify_all()
+
+    def run_if_idle(self, callback: Callable[[], None]) -> bool:
+        """Executa `callback` sob o lock da fila se nada estiver pendente nem em processamento"""
+        with self._cond:
+            if self._pending or self._in_progress:
+                return False
+            callback()
+            return True
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+
+def extract_ticket_id(payload: Dict[str, Any]) -> Optional[int]:
+    """ID do ticket no corpo do webhook (formato livre da automação do Freshdesk)"""
+    candidates = [payload]
+    if isinstance(payload.get('freshdesk_webhook'), dict):
+        candidates.insert(0, payload['freshdesk_webhook'])
+    if isinstance(payload.get('ticket'), dict):
+        candidates.append(payload['ticket'])
+
+    for data in candidates:
+        for key in ('ticket_id', 'id'):
+            value = data.get(key)
+            try:
+                if value is not None:
+                    return int(value)
+            except (TypeError, ValueError):
+                continue
+    return None
+
+
+class WebhookServer:
+    """Recebe webhooks, enfileira e processa com workers via SyncService"""
+
+    def __init__(self, sync_service: SyncService, host: str = '0.0.0.0', port: int = 8080,
+                 workers: int = 2, secret: Optional[str] = None, debounce: float = DEFAULT_DEBOUNCE):
+        self.sync_service = sync_service
+        self.queue = CoalescingQueue(debounce)
+        self.workers = max(1, workers)
+        self.secret = secret
+        self.stats = {"success": 0, "failed": 0, "skipped": 0}
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip('/') != '/health':
+                    self._reply(404, {"error": "not found"})
+                    return
+                self._reply(200, {"status": "ok", "pending": len(server.queue), **server.stats})
+
+            def do_POST(self):
+                if self.path.split('?')[0].rstrip('/') != '/webhook/freshdesk':
+                    self._reply(404, {"error": "not found"})
+                    return
+                if not server._authorized(self.headers.get('X-Webhook-Token', '')):
+                    self._reply(401, {"error": "unauthorized"})
+                    return
+
+                length = int(self.headers.get('Content-Length') or 0)
+                if length <= 0 or length > MAX_BODY_BYTES:
+                    self._reply(400, {"error": "invalid body"})
+                    return
+                try:
+                    payload = json.loads(self.rfile.read(length))
+                except ValueError:
+                    self._reply(400, {"error": "invalid json"})
+                    return
+
+                ticket_id = extract_ticket_id(payload) if isinstance(payload, dict) else None
+                if ticket_id is None:
+                    self._reply(400, {"error": "ticket id not found"})
+                    return
+
+                server.queue.put(ticket_id, payload)
+                self._reply(202, {"queued": ticket_id})
+
+            def _reply(self, status: int, body: Dict[str, Any]):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                logger.debug("🌐 %s " + format, self.address_string(), *args)
+
+        return Handler
+
+    def _authorized(self, token: str) -> bool:
+        if not self.secret:
+            return True
+        return hmac.compare_digest(token.encode('utf-8'), self.secret.encode('utf-8'))
+
+    def _process(self, ticket_id: int):
+        """Busca o estado atual do ticket e sincroniza"""
+        with grouped_logs(logger):
+            logger.info("\n📨 Webhook: ticket #%s", ticket_id)
+            error = None
+            try:
+                ticket = self.sync_service.freshdesk.get_ticket_by_id(ticket_id)
+                if ticket is None:
+                    logger.error("❌ Ticket #%s não encontrado no Freshdesk", ticket_id)
+                    result, error = RESULT_FAILED, "ticket não encontrado no Freshdesk"
+                else:
+                    result = self.sync_service.sync_ticket(ticket)
+            except Exception as e:
+                logger.error("❌ Erro no ticket #%s: %s", ticket_id, e)
+                result, error = RESULT_FAILED, str(e)
+            self.sync_service.track_result(ticket_id, result, error)
+
+        with self._stats_lock:
+            self.stats[result] += 1
+
+    def _worker(self):
+        while not self._stop.is_set():
+            item = self.queue.get(timeout=1.0)
+            if item is None:
+                # Fila ociosa: descarta caches da "execução" para não ficarem velhos,
+                # nunca enquanto outro worker ainda processa um ticket
+                self.queue.run_if_idle(self.sync_service.reset_run_state)
+                continue
+            ticket_id, _ = item
+            try:
+                self._process(ticket_id)
+            finally:
+                self.queue.done(ticket_id)
+
+    def serve_forever(self):
+        """Inicia workers e servidor HTTP (bloqueia até Ctrl+C)"""
+        threads = [
+            threading.Thread(target=self._worker, name=f"webhook-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        host, port = self.httpd.server_address[:2]
+        logger.info(f"📡 Servidor de webhooks em http://{host}:{port}/webhook/freshdesk ({self.workers} workers)")
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("👋 Encerrando servidor de webhooks...")
+        finally:
+            self.shutdown()
+            for thread in threads:
+                thread.join(timeout=5)
+
+    def shutdown(self):
+        self._stop.set()
+        self.httpd.server_close()
@@ -2,22 +2,219 @@
 """
 Configurações globais do sistema
 """
+import importlib
 import os
-from typing import Dict, Any
+import threading
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional
 
-def load_client_config(client_name: str) -> Dict[str, Any]:
-    """Carrega configuração específica do cliente"""
+# Textos aceitos em opções booleanas (ex: valores vindos de os.getenv)
+_TRUE_VALUES = ('1', 'true', 'yes', 'on', 'sim')
+_FALSE_VALUES = ('0', 'false', 'no', 'off', 'nao', 'não', '')
+
+def _parse_bool(value: Any) -> bool:
+    """Booleano de configuração: bool, 0/1 ou texto como 'true'/'false' (ValueError nos demais)"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in _TRUE_VALUES:
+            return True
+        if text in _FALSE_VALUES:
+            return False
+    raise ValueError(f"booleano inválido: {value!r}")
+
+def _env_bool(name: str, default: str) -> bool:
+    """Variável de ambiente booleana (ValueError com o nome da variável se inválida)"""
     try:
-        module = __import__(f"config.{client_name}", fromlist=[client_name])
+        return _parse_bool(os.getenv(name, default))
+    except ValueError as e:
+        raise ValueError(f"{name}: {e}") from None
+
+# Diretório com o estado persistente de cada cliente (índices, checkpoints)
+STATE_DIR = os.getenv('SYNC_STATE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.sync_state'))
+
+# Logging: nível, formato ('text' ou 'json') e emissão por fila em thread própria
+# (opcional: indicada para daemon/serve, onde não há saída interativa a intercalar)
+LOG_LEVEL = os.getenv('SYNC_LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('SYNC_LOG_FORMAT', 'text').lower()
+LOG_QUEUE = _env_bool('SYNC_LOG_QUEUE', '0')
+
+# Teste de conexão: resultado reaproveitado por este tempo (s) no mesmo processo
+HEALTH_CHECK_TTL = int(os.getenv('SYNC_HEALTH_CHECK_TTL', '300'))
+SKIP_HEALTH_CHECK = _env_bool('SYNC_SKIP_HEALTH_CHECK', '0')
+
+# Modo daemon: limites do intervalo adaptativo entre sincronizações de cada cliente (s)
+DAEMON_MIN_INTERVAL = int(os.getenv('SYNC_DAEMON_MIN_INTERVAL', '120'))
+DAEMON_MAX_INTERVAL = int(os.getenv('SYNC_DAEMON_MAX_INTERVAL', '7200'))
+DAEMON_START_INTERVAL = int(os.getenv('SYNC_DAEMON_START_INTERVAL', '900'))
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config')
+
+def discover_clients() -> List[str]:
+    """Lista os clientes com arquivo de configuração em config/"""
+    clients = []
+    for filename in sorted(os.listdir(CONFIG_DIR)):
+        name, ext = os.path.splitext(filename)
+        if ext != '.py' or name.startswith('_') or name == 'template' or name.endswith('.template'):
+            continue
+        clients.append(name)
+    return clients
+
+class ConfigError(ValueError):
+    """Configuração de cliente ausente ou inválida"""
+
+@dataclass(frozen=True, slots=True)
+class ClientConfig:
+    """Configuração validada e imutável de um cliente
+
+    Campos opcionais em None usam o padrão do módulo que os consome
+    (pool e concorrência dos provedores, TTL do cache de transições).
+    """
+    name: str
+    freshdesk_domain: str
+    freshdesk_api_key: str
+    jira_base_url: str
+    jira_email: str
+    jira_api_token: str
+    jira_project_key: str
+    # Status Freshdesk → id da transição Jira, pronto para consulta direta
+    transitions: Mapping[int, str]
+    status_names: Mapping[int, str] = field(default_factory=lambda: MappingProxyType({}))
+    default_sync_hours: int = 24
+    freshdesk_base_url: Optional[str] = None
+    freshdesk_server_filter: bool = True
+    freshdesk_max_concurrency: Optional[int] = None
+    jira_pool_size: Optional[int] = None
+    jira_max_concurrency: Optional[int] = None
+    jira_bulk_transitions: bool = True
+    transition_cache_ttl: Optional[float] = None
+    max_retries: Optional[int] = None
+    retry_base_delay: Optional[float] = None
+    retry_max_delay: Optional[float] = None
+    webhook_secret: Optional[str] = None
+
+# Atributos do módulo de configuração → campos de ClientConfig
+_REQUIRED_FIELDS = {
+    'FRESHDESK_DOMAIN': 'freshdesk_domain',
+    'FRESHDESK_API_KEY': 'freshdesk_api_key',
+    'JIRA_BASE_URL': 'jira_base_url',
+    'JIRA_EMAIL': 'jira_email',
+    'JIRA_API_TOKEN': 'jira_api_token',
+    'JIRA_PROJECT_KEY': 'jira_project_key',
+}
+_OPTIONAL_FIELDS = {
+    'DEFAULT_SYNC_HOURS': ('default_sync_hours', int),
+    'FRESHDESK_BASE_URL': ('freshdesk_base_url', str),
+    'FRESHDESK_SERVER_FILTER': ('freshdesk_server_filter', _parse_bool),
+    'FRESHDESK_MAX_CONCURRENCY': ('freshdesk_max_concurrency', int),
+    'JIRA_POOL_SIZE': ('jira_pool_size', int),
+    'JIRA_MAX_CONCURRENCY': ('jira_max_concurrency', int),
+    'JIRA_BULK_TRANSITIONS': ('jira_bulk_transitions', _parse_bool),
+    'TRANSITION_CACHE_TTL': ('transition_cache_ttl', float),
+    'MAX_RETRIES': ('max_retries', int),
+    'RETRY_BASE_DELAY': ('retry_base_delay', float),
+    'RETRY_MAX_DELAY': ('retry_max_delay', float),
+    'WEBHOOK_SECRET': ('webhook_secret', str),
+}
+
+_client_configs: Dict[str, ClientConfig] = {}
+_client_configs_lock = threading.Lock()
+
+def compile_client_config(client_name: str, values: Mapping[str, Any]) -> ClientConfig:
+    """Valida os valores de configuração e monta o ClientConfig (ConfigError se inválidos)"""
+    errors = []
+    fields = {'name': client_name}
+    
+    for key, name in _REQUIRED_FIELDS.items():
+        value = values.get(key)
+        if not isinstance(value, str) or not value.strip():
+            errors.append(f"{key} ausente ou vazio")
+        else:
+            fields[name] = value.strip()
+    
+    transitions = {}
+    raw_transitions = values.get('FRESHDESK_TO_JIRA_TRANSITIONS')
+    if not isinstance(raw_transitions, Mapping) or not raw_transitions:
+        errors.append("FRESHDESK_TO_JIRA_TRANSITIONS ausente ou vazio")
+    else:
+        for status, transition_id in raw_transitions.items():
+            try:
+                transitions[int(status)] = str(transition_id)
+            except (TypeError, ValueError):
+                errors.append(f"FRESHDESK_TO_JIRA_TRANSITIONS: status inválido {status!r}")
+            if not str(transition_id).strip():
+                errors.append(f"FRESHDESK_TO_JIRA_TRANSITIONS: transição vazia para o status {status!r}")
+    fields['transitions'] = MappingProxyType(transitions)
+    
+    status_names = {}
+    raw_status_names = values.get('FRESHDESK_STATUS_NAMES') or {}
+    if not isinstance(raw_status_names, Mapping):
+        errors.append("FRESHDESK_STATUS_NAMES deve ser um dicionário {status: nome}")
+    else:
+        for status, status_name in raw_status_names.items():
+            try:
+                status_names[int(status)] = str(status_name)
+            except (TypeError, ValueError):
+                errors.append(f"FRESHDESK_STATUS_NAMES: status inválido {status!r}")
+    fields['status_names'] = MappingProxyType(status_names)
+    
+    for key, (name, kind) in _OPTIONAL_FIELDS.items():
+        value = values.get(key)
+        if value is None:
+            continue
+        try:
+            fields[name] = kind(value)
+        except (TypeError, ValueError):
+            errors.append(f"{key}: valor inválido {value!r}")
+            continue
+        if key == 'MAX_RETRIES':
+            if fields[name] < 0:
+                errors.append(f"{key} não pode ser negativo")
+        elif kind in (int, float) and fields[name] <= 0:
+            errors.append(f"{key} deve ser positivo")
+    
+    # Validações do próprio arquivo (ex: valores ainda com o texto do template)
+    validate = values.get('validate_config')
+    if callable(validate):
+        reported = {error.split()[0].rstrip(':') for error in errors}
+        errors.extend(error for error in validate() if error.split()[0] not in reported)
+    
+    if errors:
+        raise ConfigError(f"Configuração inválida para '{client_name}': " + "; ".join(errors))
+    return ClientConfig(**fields)
+
+def load_client_config(client_name: str) -> ClientConfig:
+    """Carrega e valida a configuração do cliente (uma vez por processo)"""
+    with _client_configs_lock:
+        cached = _client_configs.get(client_name)
+        if cached is not None:
+            return cached
         
-        config = {}
-        for attr in dir(module):
-            if not attr.startswith('_'):
-                config[attr] = getattr(module, attr)
+        try:
+            module = importlib.import_module(f"config.{client_name}")
+        except ImportError:
+            raise ConfigError(f"Configuração para cliente '{client_name}' não encontrada")
         
+        values = {attr: getattr(module, attr) for attr in dir(module) if not attr.startswith('_')}
+        config = compile_client_config(client_name, values)
+        _client_configs[client_name] = config
         return config
-    except ImportError:
-        raise ValueError(f"Configuração para cliente '{client_name}' não encontrada")
+
+def load_all_client_configs() -> Dict[str, ClientConfig]:
+    """Configuração de todos os clientes de config/; ConfigError lista os inválidos"""
+    configs, errors = {}, []
+    for client_name in discover_clients():
+        try:
+            configs[client_name] = load_client_config(client_name)
+        except ConfigError as e:
+            errors.append(str(e))
+    if errors:
+        raise ConfigError("\n".join(errors))
+    return configs
 
 def get_settings() -> Dict[str, Any]:
     """Retorna configurações do sistema"""
@@ -25,5 +222,8 @@ def get_settings() -> Dict[str, Any]:
         'DEFAULT_HOURS_BACK': 24,
         'MAX_RETRIES': 3,
         'TIMEOUT': 30,
-        'LOG_LEVEL': 'INFO'
+        'LOG_LEVEL': LOG_LEVEL,
+        'LOG_FORMAT': LOG_FORMAT,
+        'LOG_QUEUE': LOG_QUEUE,
+        'STATE_DIR': STATE_DIR
     }
\ No newline at end of file
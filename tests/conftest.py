@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""
+Configuração comum dos testes: raiz do projeto no sys.path
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
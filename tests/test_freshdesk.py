@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Paginação por chave (updated_at) do FreshdeskClient
+"""
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+import providers.freshdesk as freshdesk
+from providers.freshdesk import FreshdeskClient
+
+PER_PAGE = 3
+
+
+class FakeResponse:
+    """Resposta mínima de /tickets: corpo JSON e cabeçalho Link"""
+
+    def __init__(self, items, next_page=None):
+        self.text = json.dumps(items)
+        self.links = {'next': {'url': f'/api/v2/tickets?page={next_page}'}} if next_page else {}
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeTicketsAPI:
+    """Simula /tickets com updated_since, ordenação por updated_at e paginação"""
+
+    def __init__(self, tickets):
+        self.tickets = {t['id']: t for t in tickets}
+        self.calls = []
+        self.on_call = None
+
+    def __call__(self, method, path, params, timeout):
+        self.calls.append(dict(params))
+        if self.on_call:
+            self.on_call(len(self.calls))
+        ordered = sorted(self.tickets.values(), key=lambda t: (t['updated_at'], t['id']))
+        matching = [t for t in ordered if t['updated_at'] >= params['updated_since']]
+        page = params['page']
+        chunk = matching[(page - 1) * PER_PAGE:page * PER_PAGE]
+        return FakeResponse(chunk, page + 1 if page * PER_PAGE < len(matching) else None)
+
+
+def ticket(ticket_id, updated_at):
+    return {'id': ticket_id, 'status': 2, 'updated_at': updated_at}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(freshdesk, 'TICKETS_PER_PAGE', PER_PAGE)
+    return FreshdeskClient('exemplo', 'chave')
+
+
+def fetch_ids(client):
+    since = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [t.id for page in client.iter_ticket_pages(updated_since=since) for t in page]
+
+
+def test_many_tickets_with_same_timestamp(client):
+    """Mais tickets no mesmo instante do que cabem numa página: todos vêm uma única vez"""
+    same = '2026-01-01T10:00:00Z'
+    tickets = [ticket(i, same) for i in range(1, 9)] + [ticket(9, '2026-01-01T11:00:00Z'),
+                                                        ticket(10, '2026-01-01T12:00:00Z')]
+    client._request = FakeTicketsAPI(tickets)
+
+    assert fetch_ids(client) == list(range(1, 11))
+
+
+def test_cursor_advances_to_last_updated_at(client):
+    tickets = [ticket(i, '2026-01-01T10:00:%02dZ' % i) for i in range(1, 8)]
+    api = FakeTicketsAPI(tickets)
+    client._request = api
+
+    assert fetch_ids(client) == list(range(1, 8))
+    assert [c['updated_since'] for c in api.calls] == [
+        '2026-01-01T00:00:00Z', '2026-01-01T10:00:03Z', '2026-01-01T10:00:05Z'
+    ]
+    assert all(c['page'] == 1 for c in api.calls)
+
+
+def test_ticket_updated_during_run_is_not_skipped(client):
+    """Ticket já entregue que muda durante a paginação não empurra os demais para fora"""
+    tickets = [ticket(i, '2026-01-01T10:00:00Z') for i in range(1, 5)]
+    tickets += [ticket(i, '2026-01-01T10:00:%02dZ' % i) for i in range(5, 10)]
+    api = FakeTicketsAPI(tickets)
+
+    def touch_first(call):
+        if call == 2:
+            api.tickets[1]['updated_at'] = '2026-01-01T11:00:00Z'
+
+    api.on_call = touch_first
+    client._request = api
+
+    ids = fetch_ids(client)
+    assert sorted(set(ids)) == list(range(1, 10))
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Mapeamento do resultado de JiraClient.bulk_transition
+"""
+import pytest
+
+from providers.jira import JiraClient
+
+ISSUES = {
+    '31': [{'id': '1001', 'key': 'SUP-1'}, {'id': '1002', 'key': 'SUP-2'}],
+    '41': [{'id': '1003', 'key': 'SUP-3'}],
+}
+
+
+@pytest.fixture
+def client():
+    return JiraClient('https://exemplo.atlassian.net', 'a@b.c', 'token')
+
+
+def run_bulk(client, task, task_id='task-1'):
+    submitted = []
+
+    def submit(transitions):
+        submitted.append(transitions)
+        return task_id
+
+    client.submit_bulk_transition = submit
+    client.wait_bulk_task = lambda task_id, timeout: task
+    return client.bulk_transition(ISSUES), submitted
+
+
+def test_finished_task_maps_processed_ids_to_keys(client):
+    """Com a tarefa encerrada, issues fora de processedAccessibleIssues falharam"""
+    task = {'status': 'COMPLETE', 'processedAccessibleIssues': [1001, 1003]}
+
+    results, submitted = run_bulk(client, task)
+
+    assert submitted == [{'31': ['SUP-1', 'SUP-2'], '41': ['SUP-3']}]
+    assert results == {'SUP-1': True, 'SUP-2': False, 'SUP-3': True}
+
+
+@pytest.mark.parametrize('status', ['FAILED', 'CANCELLED', 'DEAD'])
+def test_other_final_statuses_count_as_finished(client, status):
+    results, _ = run_bulk(client, {'status': status, 'processedAccessibleIssues': ['1002']})
+    assert results == {'SUP-1': False, 'SUP-2': True, 'SUP-3': False}
+
+
+@pytest.mark.parametrize('task', [
+    None,
+    {'status': 'RUNNING', 'processedAccessibleIssues': [1001]},
+    {'status': 'ENQUEUED'},
+])
+def test_unfinished_task_leaves_pending_issues_unknown(client, task):
+    """Sem o fim da tarefa o Jira ainda pode aplicar as transições: resultado None, não False"""
+    results, _ = run_bulk(client, task)
+
+    processed = (task or {}).get('processedAccessibleIssues') or []
+    assert results['SUP-1'] is (True if processed else None)
+    assert results['SUP-2'] is None
+    assert results['SUP-3'] is None
+
+
+def test_submit_failure_returns_none(client):
+    results, _ = run_bulk(client, None, task_id=None)
+    assert results is None
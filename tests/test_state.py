@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Ledger de envios e fila de retry (SQLite) e seu uso pelo SyncService
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from schemas.ledger import SyncLedger
+from schemas.retries import RETRY_DEAD, RETRY_PENDING, RetryQueue
+from schemas.state import open_state_db
+from schemas.ticket import Ticket
+from services.sync import RESULT_FAILED, RESULT_SUCCESS, SyncService
+from settings import ClientConfig
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def conn():
+    conn = open_state_db(':memory:')
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def service(conn):
+    config = ClientConfig(
+        name='teste', freshdesk_domain='exemplo', freshdesk_api_key='chave',
+        jira_base_url='https://exemplo.atlassian.net', jira_email='a@b.c', jira_api_token='token',
+        jira_project_key='SUP', transitions={4: '31', 5: '41'}
+    )
+    service = SyncService(None, None, config, ledger=SyncLedger(conn),
+                          retries=RetryQueue(conn, max_retries=2, base_delay=60, max_delay=600))
+    service.set_dry_run(False)
+    return service
+
+
+def test_ledger_skips_unchanged_status(service):
+    service.ledger.record(10, 4, '2026-01-01T10:00:00Z', 'SUP-1', '31')
+
+    should_sync, reason = service._should_sync_ticket(Ticket(10, 4))
+    assert not should_sync
+    assert 'inalterado' in reason
+
+    assert service._should_sync_ticket(Ticket(10, 5))[0]
+    assert service._should_sync_ticket(Ticket(11, 4))[0]
+
+
+def test_ledger_survives_reopen(conn):
+    SyncLedger(conn).record(10, 4, None, 'SUP-1', '31')
+
+    ledger = SyncLedger(conn)
+    assert ledger.is_unchanged(10, 4)
+    assert not ledger.is_unchanged(10, 5)
+    assert ledger.get(10).issue_key == 'SUP-1'
+
+
+def test_retry_backoff_grows_and_caps(conn):
+    queue = RetryQueue(conn, base_delay=60, max_delay=600)
+
+    for attempts, delay in [(1, 60), (2, 120), (3, 240), (4, 480), (5, 600), (10, 600)]:
+        for _ in range(20):
+            assert delay / 2 <= queue.backoff(attempts) <= delay
+
+
+def test_retry_schedules_then_dead_letters(conn):
+    queue = RetryQueue(conn, max_retries=2, base_delay=60, max_delay=600)
+
+    first = queue.record_failure(7, 'erro 1', now=NOW)
+    assert first.state == RETRY_PENDING and first.attempts == 1
+    next_attempt = datetime.fromisoformat(first.next_attempt_at)
+    assert NOW + timedelta(seconds=30) <= next_attempt <= NOW + timedelta(seconds=60)
+    assert queue.due(now=NOW) == []
+    assert queue.due(now=NOW + timedelta(seconds=60)) == [7]
+
+    assert queue.record_failure(7, 'erro 2', now=NOW).state == RETRY_PENDING
+    dead = queue.record_failure(7, 'erro 3', now=NOW)
+    assert dead.state == RETRY_DEAD and dead.attempts == 3
+    assert queue.due(now=NOW + timedelta(days=1)) == []
+
+    # A fila persiste e replay() devolve o ticket às pendentes, zerando as tentativas
+    reopened = RetryQueue(conn, max_retries=2)
+    assert reopened.get(7).state == RETRY_DEAD
+    assert reopened.replay(now=NOW) == [7]
+    assert reopened.get(7).attempts == 0
+    assert reopened.due(now=NOW) == [7]
+
+
+def test_service_tracks_failures_until_dead_letter(service):
+    for _ in range(3):
+        service.track_result(7, RESULT_FAILED, 'transição recusada')
+    assert service.retries.get(7).state == RETRY_DEAD
+
+    service.track_result(8, RESULT_FAILED)
+    service.track_result(8, RESULT_SUCCESS)
+    assert 8 not in service.retries
+
+
+def test_dry_run_does_not_touch_retry_queue(service):
+    service.set_dry_run(True)
+    service.track_result(7, RESULT_FAILED)
+    assert len(service.retries) == 0
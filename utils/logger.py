@@ -2,9 +2,80 @@
 """
 Configuração de logging
 """
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
 import sys
-from datetime import datetime
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from settings import LOG_LEVEL, LOG_FORMAT, LOG_QUEUE
+
+_local = threading.local()
+_flush_lock = threading.Lock()
+_listeners = []
+_queues = []
+
+# Campos estruturados aceitos em `extra=` e repassados ao JSON
+STRUCTURED_FIELDS = ('client', 'ticket_id', 'issue_key', 'strategy', 'result', 'duration_ms')
+
+TEXT_FORMAT = '%(asctime)s | %(levelname)s | %(message)s'
+TEXT_DATEFMT = '%Y-%m-%d %H:%M:%S'
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Um objeto JSON por linha, com os campos estruturados presentes no registro"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage().strip(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _GroupedLogFilter(logging.Filter):
+    """Retém os registros da thread enquanto um bloco agrupado está aberto"""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        buffer = getattr(_local, 'buffer', None)
+        if buffer is None:
+            return True
+        buffer.append(record)
+        return False
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Enfileira uma cópia do registro sem formatá-lo
+
+    O QueueHandler padrão formata a mensagem na thread de quem loga e
+    descarta `exc_info`; aqui a mensagem, o traceback e a serialização
+    JSON ficam para a thread do listener.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # Dicts/listas passados como argumento podem mudar até o listener formatar
+        if isinstance(record.args, tuple):
+            record.args = tuple(copy.copy(arg) if isinstance(arg, (dict, list, set)) else arg
+                                for arg in record.args)
+        elif isinstance(record.args, dict):
+            record.args = dict(record.args)
+        return record
+
 
 def get_logger(name: str = "sync") -> logging.Logger:
     """Configura e retorna logger"""
@@ -13,12 +84,60 @@ def get_logger(name: str = "sync") -> logging.Logger:
     if not logger.handlers:
         # Configurar handler
         handler = logging.StreamHandler(sys.stdout)
-        formatter = logging.Formatter(
-            '%(asctime)s | %(levelname)s | %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        logger.setLevel(logging.INFO)
+        if LOG_FORMAT == 'json':
+            handler.setFormatter(JsonLinesFormatter())
+        else:
+            handler.setFormatter(logging.Formatter(TEXT_FORMAT, datefmt=TEXT_DATEFMT))
+        
+        if LOG_QUEUE:
+            # Quem loga só copia o registro; formatação e escrita ficam na thread do listener
+            logger.addHandler(_DeferredQueueHandler(_start_listener(handler)))
+        else:
+            logger.addHandler(handler)
+        logger.addFilter(_GroupedLogFilter())
+        logger.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+        logger.propagate = False
     
-    return logger
\ No newline at end of file
+    return logger
+
+
+def _start_listener(handler: logging.Handler) -> "queue.Queue":
+    """Inicia o QueueListener que escreve os registros de fato"""
+    records: "queue.Queue" = queue.Queue()
+    listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+    listener.start()
+    if not _listeners:
+        atexit.register(stop_logging)
+    _listeners.append(listener)
+    _queues.append(records)
+    return records
+
+
+def flush_logs():
+    """Espera o listener escrever os logs já enfileirados (antes de print/input no terminal)"""
+    for records in list(_queues):
+        records.join()
+
+
+def stop_logging():
+    """Esvazia a fila de logs pendentes (chamado automaticamente na saída)"""
+    while _listeners:
+        _listeners.pop().stop()
+    _queues.clear()
+
+
+@contextmanager
+def grouped_logs(logger: logging.Logger):
+    """Agrupa os logs da thread atual e emite todos juntos ao final
+
+    Usado no modo concorrente para que as linhas de um ticket não se
+    misturem com as de outros workers.
+    """
+    _local.buffer = []
+    try:
+        yield
+    finally:
+        records, _local.buffer = _local.buffer, None
+        with _flush_lock:
+            for record in records:
+                logger.handle(record)
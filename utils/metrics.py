@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Métricas da sincronização: contadores e histogramas com exportação JSON e Prometheus
+"""
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+PREFIX = 'fdsync_'
+
+# Nomes das métricas
+API_REQUESTS = 'api_requests_total'
+API_SECONDS = 'api_request_seconds'
+RATE_LIMIT_SLEEP = 'rate_limit_sleep_seconds_total'
+RESOLUTIONS = 'resolutions_total'
+RESOLUTION_SECONDS = 'resolution_seconds'
+PHASE_SECONDS = 'phase_seconds_total'
+TICKETS = 'tickets_total'
+TICKET_SECONDS = 'ticket_seconds'
+
+DESCRIPTIONS = {
+    API_REQUESTS: 'Chamadas HTTP por provedor, endpoint e status',
+    API_SECONDS: 'Latência das chamadas HTTP por provedor e endpoint',
+    RATE_LIMIT_SLEEP: 'Tempo dormindo por rate limit, por provedor',
+    RESOLUTIONS: 'Tentativas de resolução ticket → issue por estratégia e resultado (hit/miss)',
+    RESOLUTION_SECONDS: 'Latência de cada estratégia de resolução',
+    PHASE_SECONDS: 'Tempo gasto em cada fase da sincronização',
+    TICKETS: 'Tickets processados por resultado',
+    TICKET_SECONDS: 'Latência de processamento por ticket',
+}
+
+# Limites dos buckets dos histogramas, em segundos
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Histograma de buckets fixos (cumulativos na exportação, como no Prometheus)"""
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[index] += 1
+                return
+
+    def quantile(self, q: float) -> float:
+        """Estimativa do quantil: limite superior do bucket que o contém"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound if bound != math.inf else BUCKETS[-2]
+        return BUCKETS[-2]
+
+
+class MetricsRegistry:
+    """Contadores e histogramas rotulados, seguros entre threads"""
+
+    def __init__(self):
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, str]) -> Tuple[str, Labels]:
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        """Observa no histograma a duração do bloco"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        """Acumula a duração do bloco no contador da fase"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.inc(PHASE_SECONDS, time.perf_counter() - started, phase=phase)
+
+    def counter(self, name: str, **labels) -> float:
+        """Valor de um contador (soma dos rótulos não informados)"""
+        wanted = set((k, str(v)) for k, v in labels.items())
+        with self._lock:
+            return sum(value for (metric, key), value in self._counters.items()
+                       if metric == name and wanted <= set(key))
+
+    def hit_rates(self) -> Dict[str, Dict[str, float]]:
+        """Hits, misses e taxa de acerto por estratégia de resolução"""
+        rates: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            for (metric, labels), value in self._counters.items():
+                if metric != RESOLUTIONS:
+                    continue
+                labels = dict(labels)
+                entry = rates.setdefault(labels.get('strategy', ''), {'hits': 0, 'misses': 0})
+                entry['hits' if labels.get('outcome') == 'hit' else 'misses'] += value
+        for entry in rates.values():
+            attempts = entry['hits'] + entry['misses']
+            entry['hit_rate'] = round(entry['hits'] / attempts, 4) if attempts else 0.0
+        return rates
+
+    def snapshot(self) -> Dict[str, List[Dict]]:
+        """Cópia serializável de todas as métricas"""
+        with self._lock:
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': round(value, 6)}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            histograms = [
+                {
+                    'name': name,
+                    'labels': dict(labels),
+                    'count': histogram.count,
+                    'sum': round(histogram.sum, 6),
+                    'p50': histogram.quantile(0.5),
+                    'p99': histogram.quantile(0.99),
+                }
+                for (name, labels), histogram in sorted(self._histograms.items())
+            ]
+        return {'counters': counters, 'histograms': histograms}
+
+    def to_json(self, **extra) -> str:
+        """Relatório JSON: métricas, taxa de acerto por estratégia e campos extras"""
+        report = dict(extra)
+        report.update(self.snapshot())
+        report['strategies'] = self.hit_rates()
+        return json.dumps(report, indent=2, ensure_ascii=False)
+
+    def to_prometheus(self, **const_labels) -> str:
+        """Formato de exposição de texto do Prometheus"""
+        lines: List[str] = []
+        described = set()
+
+        def header(name: str, kind: str):
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {PREFIX}{name} {DESCRIPTIONS.get(name, name)}")
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                header(name, 'counter')
+                lines.append(f"{PREFIX}{name}{_format_labels(labels, const_labels)} {_format_value(value)}")
+
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                header(name, 'histogram')
+                cumulative = 0
+                for bound, count in zip(BUCKETS, histogram.counts):
+                    cumulative += count
+                    le = '+Inf' if bound == math.inf else repr(bound)
+                    lines.append(f"{PREFIX}{name}_bucket{_format_labels(labels, const_labels, le=le)} {cumulative}")
+                lines.append(f"{PREFIX}{name}_sum{_format_labels(labels, const_labels)} "
+                             f"{_format_value(histogram.sum)}")
+                lines.append(f"{PREFIX}{name}_count{_format_labels(labels, const_labels)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Labels, const_labels: Dict[str, str], **extra) -> str:
+    pairs = list(const_labels.items()) + list(labels) + list(extra.items())
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value: float) -> str:
+    return repr(round(value, 6)) if isinstance(value, float) else str(value)
+
+
+def write_report(registry: MetricsRegistry, directory: str, name: str, **extra) -> Tuple[str, str]:
+    """Grava <name>.json e <name>.prom no diretório; retorna os caminhos"""
+    os.makedirs(directory, exist_ok=True)
+    json_path = os.path.join(directory, f"{name}.json")
+    prom_path = os.path.join(directory, f"{name}.prom")
+
+    with open(json_path, 'w', encoding='utf-8') as output:
+        output.write(registry.to_json(client=name, **extra))
+    with open(prom_path, 'w', encoding='utf-8') as output:
+        output.write(registry.to_prometheus(client=name))
+    return json_path, prom_path
+
+
+def endpoint_label(path: str) -> str:
+    """Caminho sem query e com ids/chaves trocados por marcadores (baixa cardinalidade)"""
+    segments = []
+    for segment in path.split('?', 1)[0].split('/'):
+        if segment.isdigit() and segments[-1:] != ['api']:
+            segment = '{id}'
+        elif '-' in segment and segment.rsplit('-', 1)[1].isdigit() and segment.rsplit('-', 1)[0].isupper():
+            segment = '{key}'
+        segments.append(segment)
+    return '/'.join(segments)
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Rate limiter adaptativo (token bucket) por host
+"""
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+RATE_LIMIT_RETRIES = 3    # novas tentativas após HTTP 429
+
+
+class RateLimiter:
+    """Token bucket ajustado pelos cabeçalhos de rate limit da API
+
+    Sem limite até a API informar uma cota; a partir daí:
+
+    - `X-RateLimit-FillRate` por `X-RateLimit-Interval-Seconds` (Jira Cloud)
+      define a taxa, e `X-RateLimit-Limit` o tamanho do balde
+    - sem esses, `X-RateLimit-Total`/`X-RateLimit-Limit` é a cota da janela
+      do provedor (`window`, em segundos; Freshdesk: por minuto)
+    - `X-RateLimit-Remaining` limita os tokens disponíveis; zerado sem taxa
+      conhecida, bloqueia até `X-RateLimit-Reset`
+    - `Retry-After` bloqueia o host pelo tempo pedido
+    """
+
+    def __init__(self, host: str, window: Optional[float] = None):
+        self.host = host
+        self.window = window
+        self.rate: Optional[float] = None
+        self.capacity: Optional[float] = None
+        self.tokens = 0.0
+        self.slept = 0.0
+        self._blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        if self.rate is not None:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Consome um token, esperando se necessário; retorna o tempo dormido"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self.rate is None:
+                    self.slept += waited
+                    return waited
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    self.slept += waited
+                    return waited
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def update_from_response(self, response):
+        """Ajusta taxa e tokens conforme os cabeçalhos da resposta"""
+        headers = response.headers
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            limit = _header_float(headers, 'X-RateLimit-Total') or _header_float(headers, 'X-RateLimit-Limit')
+            fill_rate = _header_float(headers, 'X-RateLimit-FillRate')
+            interval = _header_float(headers, 'X-RateLimit-Interval-Seconds')
+            rate = capacity = None
+            if fill_rate and interval:
+                rate, capacity = fill_rate / interval, limit or fill_rate
+            elif limit and self.window:
+                rate, capacity = limit / self.window, limit
+            if rate:
+                if self.rate is None:
+                    self.tokens = capacity
+                self.rate, self.capacity = rate, capacity
+                self.tokens = min(self.tokens, capacity)
+
+            remaining = _header_float(headers, 'X-RateLimit-Remaining')
+            if remaining is not None:
+                if self.rate is not None:
+                    self.tokens = min(self.tokens, remaining)
+                elif remaining <= 0:
+                    reset_in = _reset_seconds(headers.get('X-RateLimit-Reset'))
+                    if reset_in:
+                        self._blocked_until = max(self._blocked_until, now + reset_in)
+
+            retry_after = _retry_after_seconds(headers.get('Retry-After'))
+            if retry_after is not None:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+                self.tokens = 0.0
+                logger.warning("⏳ Limite de requisições em %s: aguardando %.1fs", self.host, retry_after)
+
+
+def _header_float(headers, name: str) -> Optional[float]:
+    value = headers.get(name)
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _reset_seconds(value: Optional[str]) -> Optional[float]:
+    """X-RateLimit-Reset em segundos a partir de agora (timestamp ISO 8601 do Jira)"""
+    if not value:
+        return None
+    try:
+        reset_at = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if reset_at.tzinfo is None:
+        reset_at = reset_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (reset_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Retry-After em segundos ou data HTTP"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(host: str, window: Optional[float] = None) -> RateLimiter:
+    """Limiter compartilhado por todos os clientes do mesmo host
+
+    `window` é a janela (s) da cota informada em X-RateLimit-Total/Limit
+    quando o provedor não manda a taxa de reposição.
+    """
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = RateLimiter(host, window)
+        return _limiters[host]
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Janelas de tempo em UTC, marca d'água (high-water mark) e checkpoints de backfill por cliente
+"""
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from schemas.state import state_lock
+
+# Sobreposição com a execução anterior, cobrindo relógios e atrasos de indexação
+OVERLAP = timedelta(minutes=5)
+
+
+def utc_now() -> datetime:
+    """Agora, com fuso UTC"""
+    return datetime.now(timezone.utc)
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Converte timestamp ISO 8601 (com 'Z' ou offset) para datetime UTC"""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def format_timestamp(value: datetime) -> str:
+    """Formato aceito pela API do Freshdesk (UTC, sufixo Z)"""
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+@dataclass(frozen=True)
+class TimeWindow:
+    """Intervalo [start, end) em UTC"""
+    start: datetime
+    end: datetime
+    
+    @property
+    def hours(self) -> float:
+        return (self.end - self.start).total_seconds() / 3600
+    
+    def __str__(self) -> str:
+        return f"{format_timestamp(self.start)} → {format_timestamp(self.end)}"
+
+
+def window_since_hours(hours: float, now: Optional[datetime] = None) -> TimeWindow:
+    """Janela das últimas `hours` horas até agora"""
+    end = now or utc_now()
+    return TimeWindow(end - timedelta(hours=hours), end)
+
+
+def split_window(window: TimeWindow, size: timedelta) -> List[TimeWindow]:
+    """Divide a janela em janelas consecutivas de `size` (a última pode ser menor)
+
+    Os limites dependem só do início e do tamanho, então a mesma divisão
+    se repete entre execuções e os checkpoints continuam valendo.
+    """
+    if size <= timedelta(0):
+        raise ValueError("Tamanho da janela deve ser positivo")
+    
+    windows = []
+    start = window.start
+    while start < window.end:
+        end = min(start + size, window.end)
+        windows.append(TimeWindow(start, end))
+        start = end
+    return windows
+
+
+def align_to_window(start: datetime, end: datetime, size: timedelta) -> datetime:
+    """Recua `end` até o último limite de janela (contado a partir de `start`)
+
+    Sem um fim explícito o backfill terminaria em "agora", e a última janela,
+    parcial, ganharia uma chave de checkpoint nova a cada execução. Alinhando
+    o fim, só entram janelas completas e as chaves se repetem entre execuções.
+    """
+    if size <= timedelta(0):
+        raise ValueError("Tamanho da janela deve ser positivo")
+    if end <= start:
+        return start
+    return start + size * ((end - start) // size)
+
+
+def incremental_window(mark: Optional[datetime], default_hours: float,
+                       now: Optional[datetime] = None, overlap: timedelta = OVERLAP) -> TimeWindow:
+    """Janela desde a última execução bem-sucedida (ou das últimas horas na primeira vez)"""
+    end = now or utc_now()
+    if mark is None:
+        return window_since_hours(default_hours, end)
+    return TimeWindow(min(mark - overlap, end), end)
+
+
+class HighWaterMark:
+    """Fim da última janela sincronizada com sucesso, persistido no banco do cliente"""
+    
+    def __init__(self, conn: sqlite3.Connection, name: str = 'tickets'):
+        self._conn = conn
+        self._name = name
+        self._lock = state_lock(conn)
+        
+        with self._lock, self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS high_water_marks (
+                       name TEXT PRIMARY KEY,
+                       mark TEXT NOT NULL
+                   )"""
+            )
+    
+    def get(self) -> Optional[datetime]:
+        """Marca atual, ou None se nunca houve execução bem-sucedida"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mark FROM high_water_marks WHERE name = ?", (self._name,)
+            ).fetchone()
+        return parse_timestamp(row[0]) if row else None
+    
+    def advance(self, mark: datetime):
+        """Avança a marca (nunca retrocede)"""
+        current = self.get()
+        if current is not None and mark <= current:
+            return
+        
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO high_water_marks (name, mark) VALUES (?, ?)",
+                (self._name, mark.astimezone(timezone.utc).isoformat())
+            )
+
+
+class BackfillCheckpoint:
+    """Janelas de backfill já concluídas, persistidas no banco do cliente"""
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self._lock = state_lock(conn)
+        
+        with self._lock, self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS backfill_windows (
+                       start TEXT NOT NULL,
+                       end TEXT NOT NULL,
+                       success INTEGER NOT NULL,
+                       failed INTEGER NOT NULL,
+                       skipped INTEGER NOT NULL,
+                       completed_at TEXT NOT NULL,
+                       PRIMARY KEY (start, end)
+                   )"""
+            )
+    
+    @staticmethod
+    def _key(window: TimeWindow) -> Tuple[str, str]:
+        return window.start.astimezone(timezone.utc).isoformat(), window.end.astimezone(timezone.utc).isoformat()
+    
+    def completed(self) -> Set[Tuple[str, str]]:
+        """Chaves (início, fim) das janelas concluídas"""
+        with self._lock:
+            rows = self._conn.execute("SELECT start, end FROM backfill_windows").fetchall()
+        return {(row[0], row[1]) for row in rows}
+    
+    def pending(self, windows: List[TimeWindow]) -> List[TimeWindow]:
+        """Janelas ainda não concluídas, na ordem recebida"""
+        completed = self.completed()
+        return [window for window in windows if self._key(window) not in completed]
+    
+    def mark_done(self, window: TimeWindow, stats: Dict[str, int]):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO backfill_windows "
+                "(start, end, success, failed, skipped, completed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                self._key(window) + (stats.get('success', 0), stats.get('failed', 0), stats.get('skipped', 0),
+                                     utc_now().isoformat())
+            )
+    
+    def clear(self, window: TimeWindow) -> int:
+        """Esquece as janelas contidas em `window` (backfill refeito do zero)"""
+        start, end = self._key(window)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM backfill_windows WHERE start >= ? AND end <= ?", (start, end)
+            )
+        return cursor.rowcount